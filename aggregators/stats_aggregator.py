@@ -1,7 +1,12 @@
 """統計集計モジュール"""
-import json
+import heapq
+import os
+from collections import Counter
+from functools import lru_cache
 from typing import List, Dict
 
+import orjson
+
 
 class StatsAggregator:
     """動画×社長の集計統計を計算"""
@@ -13,8 +18,8 @@ class StatsAggregator:
         Args:
             tigers_file: 社長マスタJSONファイルのパス
         """
-        with open(tigers_file, 'r', encoding='utf-8') as f:
-            self.tigers = {t['tiger_id']: t for t in json.load(f)}
+        with open(tigers_file, 'rb') as f:
+            self.tigers = {t['tiger_id']: t for t in orjson.loads(f.read())}
 
     def calculate_video_stats(
         self,
@@ -34,24 +39,49 @@ class StatsAggregator:
         # N_total: 総コメント数
         N_total = len(analyzed_comments)
 
-        # 社長に言及しているコメントのセット
+        # 1パスで社長言及コメントと社長別の言及コメント数を数える
         entity_comment_ids = set()
+        tiger_counts = Counter()
         for comment in analyzed_comments:
-            if comment['tiger_mentions']:
+            mentions = comment['tiger_mentions']
+            if mentions:
                 entity_comment_ids.add(comment['comment_id'])
+                tiger_counts.update({m['tiger_id'] for m in mentions})
+
+        return self.calculate_video_stats_from_counts(
+            N_total=N_total,
+            N_entity=len(entity_comment_ids),
+            tiger_counts=tiger_counts,
+            appearing_tigers=appearing_tigers
+        )
 
-        # N_entity: 誰かしらの社長に言及しているコメント数
-        N_entity = len(entity_comment_ids)
+    def calculate_video_stats_from_counts(
+        self,
+        N_total: int,
+        N_entity: int,
+        tiger_counts: Dict[str, int],
+        appearing_tigers: List[str]
+    ) -> Dict:
+        """
+        集計済みの件数から動画ごとの社長別統計を計算
+
+        コメントをストリーミング処理しながら数えた件数をそのまま渡せる。
+
+        Args:
+            N_total: 総コメント数
+            N_entity: 誰かしらの社長に言及しているコメント数
+            tiger_counts: 社長IDごとの言及コメント数
+            appearing_tigers: 出演社長のIDリスト
 
+        Returns:
+            統計情報の辞書（calculate_video_stats と同じ形式）
+        """
         # 各社長ごとの統計
         tiger_stats = {}
 
         for tiger_id in appearing_tigers:
             # N_tiger: この社長に言及しているコメント数
-            N_tiger = sum(
-                1 for comment in analyzed_comments
-                if any(m['tiger_id'] == tiger_id for m in comment['tiger_mentions'])
-            )
+            N_tiger = tiger_counts.get(tiger_id, 0)
 
             # Rate_total: 総コメント数に対する割合（絶対的存在感）
             Rate_total = (N_tiger / N_total * 100) if N_total > 0 else 0
@@ -101,19 +131,13 @@ class StatsAggregator:
             コメントのリスト
         """
         # この社長に言及しているコメントを抽出
-        mentioned_comments = [
+        mentioned_comments = (
             comment for comment in analyzed_comments
             if any(m['tiger_id'] == tiger_id for m in comment['tiger_mentions'])
-        ]
-
-        # いいね数でソート
-        sorted_comments = sorted(
-            mentioned_comments,
-            key=lambda x: x.get('like_count', 0),
-            reverse=True
         )
 
-        return sorted_comments[:top_n]
+        # いいね数の上位だけを取り出す（全件はソートしない）
+        return heapq.nlargest(top_n, mentioned_comments, key=lambda x: x.get('like_count', 0))
 
     def calculate_period_stats(
         self,
@@ -182,6 +206,28 @@ class StatsAggregator:
         }
 
 
+@lru_cache(maxsize=4)
+def _cached_stats_aggregator(tigers_file: str, tigers_mtime: float) -> StatsAggregator:
+    """パスとmtimeをキーにStatsAggregatorを保持"""
+    return StatsAggregator(tigers_file)
+
+
+def get_stats_aggregator(tigers_file: str = 'data/tigers.json') -> StatsAggregator:
+    """
+    プロセス内で共有するStatsAggregatorを取得
+
+    社長マスタが更新されていなければ構築済みのインスタンスを再利用する。
+
+    Args:
+        tigers_file: 社長マスタJSONファイルのパス
+
+    Returns:
+        StatsAggregatorインスタンス
+    """
+    tigers_file = os.path.abspath(tigers_file)
+    return _cached_stats_aggregator(tigers_file, os.path.getmtime(tigers_file))
+
+
 # 使用例
 if __name__ == '__main__':
     from src.analyzers.comment_analyzer import CommentAnalyzer
@@ -1,9 +1,20 @@
 """コメント解析・社長言及判定モジュール（Phase 0 改修版）"""
-import json
+import os
 import re
+import sys
 import unicodedata
+from collections import Counter
+from functools import lru_cache
 from typing import List, Dict, Set, Optional
 
+import orjson
+
+# pyahocorasickがあれば全エイリアスを1回の走査で検出する（なければ1エイリアスずつ照合）
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 
 class CommentAnalyzer:
     """コメントから社長への言及を判定"""
@@ -15,6 +26,17 @@ class CommentAnalyzer:
     # 後続語パターン（敬称など）
     SUFFIX_PATTERN = r'(?:社長|さん|氏|先生|ちゃん|くん|君)'
 
+    # 境界判定で使う正規表現はクラス定義時に一度だけコンパイル
+    _WORD_CHAR_RE = re.compile(f'{JAPANESE_CHAR_PATTERN}|{ALPHANUMERIC_PATTERN}')
+    _SUFFIX_RE = re.compile(SUFFIX_PATTERN)
+    _ENDS_WITH_SUFFIX_RE = re.compile(SUFFIX_PATTERN + r'$')
+
+    # 直前にあっても境界として扱う助詞
+    PARTICLES = frozenset(['は', 'が', 'を', 'に', 'へ', 'と', 'や', 'の', 'で', 'も'])
+
+    # この文字数以下の正規化済みテキストはinternする
+    INTERN_MAX_LENGTH = 64
+
     # typeの優先順位（勝者決定用）
     TYPE_PRIORITY = {
         'fullname': 1,
@@ -37,12 +59,82 @@ class CommentAnalyzer:
             aliases_file: エイリアス辞書JSONファイルのパス
         """
         # 社長マスタを読み込み
-        with open(tigers_file, 'r', encoding='utf-8') as f:
-            self.tigers = {t['tiger_id']: t for t in json.load(f)}
+        with open(tigers_file, 'rb') as f:
+            self.tigers = {t['tiger_id']: t for t in orjson.loads(f.read())}
 
         # エイリアス辞書を読み込み
-        with open(aliases_file, 'r', encoding='utf-8') as f:
-            self.aliases = json.load(f)
+        with open(aliases_file, 'rb') as f:
+            self.aliases = orjson.loads(f.read())
+
+        # 全エイリアスの先頭文字集合（どれも含まないテキストは照合不要）
+        self._alias_first_chars = frozenset(
+            alias_info['alias'][0]
+            for alias_list in self.aliases.values()
+            for alias_info in alias_list
+            if alias_info['alias']
+        )
+
+        # 全エイリアスのオートマトン（テキストに含まれるエイリアスを一括で列挙する）
+        self._alias_automaton = self._build_alias_automaton()
+
+        # エイリアスごとの判定条件を事前計算（社長ごとにスコアの良い順）
+        self._alias_specs = {
+            tiger_id: sorted(
+                (self._build_alias_spec(alias_info) for alias_info in alias_list),
+                key=lambda spec: spec[4]
+            )
+            for tiger_id, alias_list in self.aliases.items()
+        }
+
+    def _build_alias_automaton(self):
+        """
+        全エイリアスを登録したAho-Corasickオートマトンを構築
+
+        Returns:
+            オートマトン（pyahocorasick未インストール、または空文字のエイリアスがある場合はNone）
+        """
+        if ahocorasick is None:
+            return None
+
+        automaton = ahocorasick.Automaton()
+        for alias_list in self.aliases.values():
+            for alias_info in alias_list:
+                alias = alias_info['alias']
+                if not alias:
+                    # 空文字はオートマトンに登録できないため従来の照合に任せる
+                    return None
+                automaton.add_word(alias, alias)
+
+        if len(automaton) == 0:
+            return None
+        automaton.make_automaton()
+        return automaton
+
+    def _build_alias_spec(self, alias_info: Dict) -> tuple:
+        """
+        エイリアスの照合条件を事前計算
+
+        Args:
+            alias_info: エイリアス辞書の1要素
+
+        Returns:
+            (alias, type, priority, 後続語必須, スコア, 後続チェック緩和) のタプル
+        """
+        alias = alias_info['alias']
+        alias_type = alias_info['type']
+        priority = alias_info['priority']
+
+        # 敬称で終わるエイリアスと4文字以上の長いエイリアスは後続チェックを緩和
+        relaxed = bool(self._ENDS_WITH_SUFFIX_RE.search(alias)) or len(alias) >= 4
+
+        return (
+            alias,
+            alias_type,
+            priority,
+            self._should_require_suffix(alias, alias_type),
+            self._calculate_match_score(alias, priority, alias_type),
+            relaxed,
+        )
 
     def normalize_text(self, text: str) -> str:
         """
@@ -63,9 +155,20 @@ class CommentAnalyzer:
         # 前後の空白を削除
         text = text.strip()
 
+        # 「草」「www」のような短い定型コメントは重複が多いので同一オブジェクトを共有
+        if len(text) <= self.INTERN_MAX_LENGTH:
+            text = sys.intern(text)
+
         return text
 
-    def _is_word_boundary(self, text: str, start: int, end: int, alias: str = '') -> bool:
+    def _is_word_boundary(
+        self,
+        text: str,
+        start: int,
+        end: int,
+        alias: str = '',
+        relaxed: Optional[bool] = None
+    ) -> bool:
         """
         マッチ位置が単語境界かどうかを判定
 
@@ -74,6 +177,7 @@ class CommentAnalyzer:
             start: マッチ開始位置
             end: マッチ終了位置
             alias: マッチしたエイリアス（敬称チェック用）
+            relaxed: 後続チェック緩和の事前計算結果（Noneならaliasから判定）
 
         Returns:
             単語境界であればTrue
@@ -82,31 +186,35 @@ class CommentAnalyzer:
         if start > 0:
             prev_char = text[start - 1]
             # 前の文字が日本語文字または英数字なら境界ではない
-            if re.match(self.JAPANESE_CHAR_PATTERN, prev_char) or re.match(self.ALPHANUMERIC_PATTERN, prev_char):
+            if self._WORD_CHAR_RE.match(prev_char):
                 # ただし助詞の後ろは境界として扱う
-                particles = ['は', 'が', 'を', 'に', 'へ', 'と', 'や', 'の', 'で', 'も']
-                if prev_char not in particles:
+                if prev_char not in self.PARTICLES:
                     return False
 
         # 後ろの文字チェック
         if end < len(text):
             next_char = text[end]
             # 後ろの文字が日本語文字または英数字なら境界ではない
-            if re.match(self.JAPANESE_CHAR_PATTERN, next_char) or re.match(self.ALPHANUMERIC_PATTERN, next_char):
-                # エイリアス自体が敬称で終わっている場合は境界OK
-                if re.search(self.SUFFIX_PATTERN + r'$', alias):
-                    return True
-                # 4文字以上の長いエイリアスは後続チェック緩和（誤検知リスク低い）
-                if len(alias) >= 4:
+            if self._WORD_CHAR_RE.match(next_char):
+                if relaxed is None:
+                    # エイリアス自体が敬称で終わっている場合は境界OK
+                    # 4文字以上の長いエイリアスは後続チェック緩和（誤検知リスク低い）
+                    relaxed = bool(self._ENDS_WITH_SUFFIX_RE.search(alias)) or len(alias) >= 4
+                if relaxed:
                     return True
                 # 後続が敬称かどうかチェック
-                remaining = text[end:]
-                if not re.match(self.SUFFIX_PATTERN, remaining):
+                if not self._SUFFIX_RE.match(text, end):
                     return False
 
         return True
 
-    def _match_alias_with_boundary(self, alias: str, text: str, require_suffix: bool = False) -> Optional[int]:
+    def _match_alias_with_boundary(
+        self,
+        alias: str,
+        text: str,
+        require_suffix: bool = False,
+        relaxed: Optional[bool] = None
+    ) -> Optional[int]:
         """
         境界チェック付きでエイリアスをマッチング
 
@@ -114,6 +222,7 @@ class CommentAnalyzer:
             alias: マッチするエイリアス
             text: 対象テキスト
             require_suffix: 後続語（敬称）が必須かどうか
+            relaxed: 後続チェック緩和の事前計算結果（Noneならaliasから判定）
 
         Returns:
             マッチ位置（マッチしなければNone）
@@ -127,11 +236,10 @@ class CommentAnalyzer:
             end = pos + len(alias)
 
             # 境界チェック
-            if self._is_word_boundary(text, pos, end, alias):
+            if self._is_word_boundary(text, pos, end, alias, relaxed):
                 # 後続語必須の場合は追加チェック
                 if require_suffix:
-                    remaining = text[end:]
-                    if re.match(self.SUFFIX_PATTERN, remaining):
+                    if self._SUFFIX_RE.match(text, end):
                         return pos
                 else:
                     return pos
@@ -218,52 +326,46 @@ class CommentAnalyzer:
             warnings.warn("target_tigers が指定されていません。出演虎を指定してください。", UserWarning)
             target_tigers = list(self.tigers.keys())
 
-        # 全候補を収集（後で勝者決定）
-        all_matches = []  # [(tiger_id, alias, type, priority, position, score), ...]
+        # どのエイリアスの先頭文字も含まなければ照合をスキップ
+        if self._alias_first_chars.isdisjoint(normalized_text):
+            return {
+                'normalized_text': normalized_text,
+                'mentions': []
+            }
 
-        # 各社長のエイリアスでマッチング
-        for tiger_id in target_tigers:
-            if tiger_id not in self.aliases:
+        # テキストに含まれるエイリアスを一括で列挙（含まれないエイリアスは照合不要）
+        present_aliases = None
+        if self._alias_automaton is not None:
+            present_aliases = {alias for _, alias in self._alias_automaton.iter(normalized_text)}
+            if not present_aliases:
+                return {
+                    'normalized_text': normalized_text,
+                    'mentions': []
+                }
+
+        # 勝者決定：社長ごとにスコアの良い順で照合し、最初にマッチしたものを採用
+        mentions = []
+        for tiger_id in dict.fromkeys(target_tigers):
+            specs = self._alias_specs.get(tiger_id)
+            if not specs:
                 continue
 
-            for alias_info in self.aliases[tiger_id]:
-                alias = alias_info['alias']
-                alias_type = alias_info['type']
-                priority = alias_info['priority']
-
-                # 後続語が必要かどうか判定
-                require_suffix = self._should_require_suffix(alias, alias_type)
+            for alias, alias_type, priority, require_suffix, _score, relaxed in specs:
+                if present_aliases is not None and alias not in present_aliases:
+                    continue
 
                 # 境界チェック付きマッチング
-                match_pos = self._match_alias_with_boundary(alias, normalized_text, require_suffix)
-
+                match_pos = self._match_alias_with_boundary(
+                    alias, normalized_text, require_suffix, relaxed
+                )
                 if match_pos is not None:
-                    score = self._calculate_match_score(alias, priority, alias_type)
-                    all_matches.append({
+                    mentions.append({
                         'tiger_id': tiger_id,
-                        'alias': alias,
-                        'type': alias_type,
-                        'priority': priority,
-                        'position': match_pos,
-                        'score': score
+                        'matched_alias': alias,
+                        'alias_type': alias_type,
+                        'priority': priority
                     })
-
-        # 勝者決定：同一tiger_idの中でスコアが最も良いものを選択
-        best_matches = {}
-        for match in all_matches:
-            tiger_id = match['tiger_id']
-            if tiger_id not in best_matches or match['score'] < best_matches[tiger_id]['score']:
-                best_matches[tiger_id] = match
-
-        # 結果を整形
-        mentions = []
-        for tiger_id, match in best_matches.items():
-            mentions.append({
-                'tiger_id': tiger_id,
-                'matched_alias': match['alias'],
-                'alias_type': match['type'],
-                'priority': match['priority']
-            })
+                    break
 
         return {
             'normalized_text': normalized_text,
@@ -317,14 +419,17 @@ class CommentAnalyzer:
         # 対象虎のみ集計
         tiger_ids_to_count = target_tigers if target_tigers else list(self.tigers.keys())
 
-        # 各社長の言及数をカウント
+        # 各社長の言及コメント数を1パスでカウント
+        mention_counts = Counter()
+        for comment in analyzed_comments:
+            mentions = comment['tiger_mentions']
+            if mentions:
+                mention_counts.update({m['tiger_id'] for m in mentions})
+
         for tiger_id in tiger_ids_to_count:
             if tiger_id not in self.tigers:
                 continue
-            mention_count = sum(
-                1 for comment in analyzed_comments
-                if any(m['tiger_id'] == tiger_id for m in comment['tiger_mentions'])
-            )
+            mention_count = mention_counts[tiger_id]
             stats[tiger_id] = {
                 'tiger_id': tiger_id,
                 'display_name': self.tigers[tiger_id]['display_name'],
@@ -334,6 +439,63 @@ class CommentAnalyzer:
         return stats
 
 
+def build_alias_text_index(aliases: Dict[str, List[Dict]]) -> Dict[str, str]:
+    """
+    エイリアス文字列 → aliases.jsonのキー の逆引き辞書を作成
+
+    同じ文字列が複数の社長にある場合は先に出現したキーを優先する。
+
+    Args:
+        aliases: エイリアス辞書（aliases.jsonの内容）
+
+    Returns:
+        逆引き辞書
+    """
+    index = {}
+    for key, alias_list in aliases.items():
+        for alias_info in alias_list:
+            index.setdefault(alias_info.get('alias'), key)
+    return index
+
+
+@lru_cache(maxsize=4)
+def _cached_comment_analyzer(
+    tigers_file: str,
+    aliases_file: str,
+    tigers_mtime: float,
+    aliases_mtime: float
+) -> CommentAnalyzer:
+    """パスとmtimeをキーにCommentAnalyzerを保持"""
+    return CommentAnalyzer(tigers_file, aliases_file)
+
+
+def get_comment_analyzer(
+    tigers_file: str = 'data/tigers.json',
+    aliases_file: str = 'data/aliases.json'
+) -> CommentAnalyzer:
+    """
+    プロセス内で共有するCommentAnalyzerを取得
+
+    マスタJSONが更新されていなければ構築済みのインスタンスを再利用する。
+    解析は読み取りのみなのでスレッド間で共有してよい。
+
+    Args:
+        tigers_file: 社長マスタJSONファイルのパス
+        aliases_file: エイリアス辞書JSONファイルのパス
+
+    Returns:
+        CommentAnalyzerインスタンス
+    """
+    tigers_file = os.path.abspath(tigers_file)
+    aliases_file = os.path.abspath(aliases_file)
+    return _cached_comment_analyzer(
+        tigers_file,
+        aliases_file,
+        os.path.getmtime(tigers_file),
+        os.path.getmtime(aliases_file),
+    )
+
+
 # 使用例・テスト
 if __name__ == '__main__':
     # テストデータ
@@ -4,11 +4,13 @@
 """
 import re
 import os
-import json
+import orjson
 from typing import List, Dict, Optional, Tuple
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from models import Tiger, VideoTiger, Video
+from utils.json_cache import load_json_cached
 
 # aliases.json のパス (バックエンドの data/ ディレクトリ)
 ALIASES_FILE = os.path.join(os.path.dirname(__file__), "../data/aliases.json")
@@ -22,12 +24,11 @@ class TigerExtractor:
         # 社長マスタを全件取得してキャッシュ
         self.tigers = db.query(Tiger).filter(Tiger.is_active == True).all()
 
-        # aliases.json を読み込み
+        # aliases.json を読み込み（mtimeで無効化されるキャッシュ経由、変更しないこと）
         self.aliases = {}
         try:
-            with open(ALIASES_FILE, 'r', encoding='utf-8') as f:
-                self.aliases = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+            self.aliases = load_json_cached(ALIASES_FILE)
+        except (FileNotFoundError, orjson.JSONDecodeError):
             pass
 
         # 社長名のバリエーションを構築
@@ -252,17 +253,13 @@ class TigerExtractor:
         # 新規登録が必要な社長
         new_tiger_ids = [tid for tid in all_tiger_ids if tid not in existing_tiger_ids]
 
-        # データベースに登録
-        added_count = 0
-        for tiger_id in new_tiger_ids:
-            video_tiger = VideoTiger(
-                video_id=video_id,
-                tiger_id=tiger_id
-            )
-            self.db.add(video_tiger)
-            added_count += 1
-
+        # データベースに登録（まとめてINSERT）
+        added_count = len(new_tiger_ids)
         if added_count > 0:
+            self.db.execute(
+                insert(VideoTiger),
+                [{"video_id": video_id, "tiger_id": tiger_id} for tiger_id in new_tiger_ids]
+            )
             self.db.commit()
 
         # 結果を構築
@@ -1,10 +1,17 @@
 """
 Analysis API Router - コメント収集と分析
 """
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
-from typing import Dict
-import json
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import Response, StreamingResponse
+from collections import Counter, OrderedDict, deque
+from contextlib import nullcontext
+from itertools import islice
+from typing import Any, Dict, Iterator, Optional
+import logging
+import multiprocessing
+import orjson
 import os
+import re
 import time
 import sys
 from pathlib import Path
@@ -16,86 +23,340 @@ sys.path.append(os.path.join(os.path.dirname(__file__), "../.."))
 from core.config import settings
 
 from collectors.youtube_collector import YouTubeCollector
-from analyzers.comment_analyzer import CommentAnalyzer
+from analyzers.comment_analyzer import build_alias_text_index, get_comment_analyzer
 from analyzers.tiger_extractor import TigerExtractor
-from aggregators.stats_aggregator import StatsAggregator
+from aggregators.stats_aggregator import get_stats_aggregator
 from ..schemas import CollectionRequest, CollectionProgress, AnalysisRequest, AnalysisResult, LogEntry
 from sqlalchemy.orm import Session
 from models import get_db, Video as VideoDB, Comment as CommentDB, CommentTigerRelation, VideoTigerStats, VideoTiger, Tiger as TigerDB
 from models.database import SessionLocal
-from sqlalchemy import delete
+from core.cache import cache_manager, get_collection_status_cache_key
+from utils.json_cache import (
+    atomic_write, load_json, load_json_cached, load_derived_cached, load_videos_by_id, store_json_cache
+)
+from utils.timestamps import parse_iso_datetime_or_none
+from sqlalchemy import delete, insert
+from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import threading
 
+# ijsonがあればJSON配列を1件ずつ読む（なければ全体を読み込んでから順に返す）
+try:
+    import ijson
+    _JSON_PARSE_ERRORS = (ijson.JSONError, orjson.JSONDecodeError)
+except ImportError:
+    ijson = None
+    _JSON_PARSE_ERRORS = (orjson.JSONDecodeError,)
+
 # YouTube API キーは settings から取得
 YOUTUBE_API_KEY = settings.youtube_api_key or ''
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# データファイルのパス（import時に一度だけ組み立てる）
+DATA_DIR = str(settings.data_dir)
+TIGERS_FILE = os.path.join(DATA_DIR, "tigers.json")
+ALIASES_FILE = os.path.join(DATA_DIR, "aliases.json")
+VIDEOS_FILE = os.path.join(DATA_DIR, "videos.json")
+
+# 収集ステータスの保持上限（動画数）と、動画ごとのログ保持件数
+COLLECTION_STATUS_MAX_ENTRIES = 512
+COLLECTION_LOG_MAX_ENTRIES = 200
+# この秒数更新のない完了済み（収集中以外）のステータスはメモリから破棄する
+COLLECTION_STATUS_MEMORY_TTL = 60 * 60
+
+
+class _StatusStore(OrderedDict):
+    """
+    収集ステータスの保持用辞書（_status_lock を取得して使うこと）
+
+    更新順に並べ、上限を超えた分は収集中以外のうち最も古いものから、
+    一定時間更新のない収集中以外のエントリは期限切れとして破棄する。
+    収集中のエントリと書き込んだばかりのエントリは破棄しないため、
+    ほかがすべて収集中の間は一時的に上限を超えることがある。
+    linked に渡した辞書（動画IDごとのロックなど）からも同じキーを合わせて破棄する。
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, linked: tuple = ()):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.linked = linked
+        self._updated_at: Dict[str, float] = {}
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.touch(key)
+        if len(self) > self.max_entries:
+            self._evict(len(self) - self.max_entries, keep=key)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._forget(key)
+
+    def _evict(self, count: int, keep=None):
+        """収集中以外のエントリを古い順に count 件まで破棄（keep は書き込んだばかりのため残す）"""
+        evicted = []
+        for key, progress in self.items():
+            if len(evicted) >= count:
+                break
+            if key != keep and progress.status != "collecting":
+                evicted.append(key)
+        for key in evicted:
+            del self[key]
+
+    def _forget(self, key):
+        """破棄したエントリに付随する情報を削除"""
+        self._updated_at.pop(key, None)
+        for linked in self.linked:
+            linked.pop(key, None)
+
+    def touch(self, key):
+        """エントリを最新として扱い、期限切れのエントリを掃除する"""
+        self.move_to_end(key)
+        self._updated_at[key] = time.monotonic()
+        self.expire()
+
+    def expire(self):
+        """期限切れのエントリを破棄（古い順に見て、期限内のものが出たら打ち切る）"""
+        deadline = time.monotonic() - self.ttl_seconds
+        expired = []
+        for key, progress in self.items():
+            if self._updated_at.get(key, 0) > deadline:
+                break
+            if progress.status != "collecting":
+                expired.append(key)
+        for key in expired:
+            del self[key]
+
 
 # 進捗管理用の簡易ストレージ（スレッドセーフ）
-collection_status: Dict[str, CollectionProgress] = {}
+# 動画IDごとのロックはステータスと同時に破棄されるため、ステータスの保持上限を超えて増えない
 collection_locks: Dict[str, threading.Lock] = {}
+collection_status: Dict[str, CollectionProgress] = _StatusStore(
+    COLLECTION_STATUS_MAX_ENTRIES, COLLECTION_STATUS_MEMORY_TTL, linked=(collection_locks,)
+)
 _status_lock = threading.Lock()  # collection_status/collection_locks へのアクセス用
+_videos_file_lock = threading.Lock()  # videos.json の読み書き用
+
+# YouTube URL（watch?v= / youtu.be/ / embed/ / shorts/ / live/）から動画IDを取り出す
+_VIDEO_ID_RE = re.compile(
+    r'(?:youtube\.com/watch\?(?:[^#]*?&)?v='
+    r'|youtu\.be/'
+    r'|youtube(?:-nocookie)?\.com/(?:embed|shorts|live|v)/)'
+    r'([A-Za-z0-9_-]{11})'
+)
+
+# コメント収集専用のワーカースレッド
+# BackgroundTasks（Starletteの共有スレッドプール）を長時間占有しないよう分離する
+_collect_executor = ThreadPoolExecutor(
+    max_workers=settings.collect_max_workers,
+    thread_name_prefix="collect"
+)
+
+# 収集ワーカースレッドごとのYouTubeCollector
+_collector_local = threading.local()
+
+# 収集完了からこの秒数以内の再収集リクエストは既存の結果を返す（二重クリック対策）
+RECOLLECT_COOLDOWN_SECONDS = 300
+
+# 収集ステータスをRedisに保持する期間（秒）。複数ワーカー間で進捗を共有する
+COLLECTION_STATUS_TTL = 60 * 60 * 24
+
+
+# 分析結果キャッシュ {キー: (分析結果, 出力ファイルのmtime)}（LRU）
+ANALYSIS_CACHE_MAX_ENTRIES = 128
+_analysis_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_analysis_cache_lock = threading.Lock()
 
+# 分析済みコメントをストリーミングで返す際の1チャンクの目安サイズ（バイト）
+STREAM_CHUNK_BYTES = 64 * 1024
 
-def get_collection_lock(video_id: str) -> threading.Lock:
-    """動画IDごとのロックを取得（なければ作成）"""
+# これ以上のサイズのJSON配列はijsonで逐次パースする（未満はorjsonで一括パース）
+STREAM_PARSE_MIN_BYTES = 32 * 1024 * 1024
+
+# 収集時のVideo UPSERTで上書きする列
+VIDEO_UPSERT_COLUMNS = ('title', 'description', 'thumbnail_url', 'view_count', 'like_count', 'comment_count')
+
+# VideoTigerStatsのUPSERTで上書きする列
+VIDEO_TIGER_STATS_UPSERT_COLUMNS = ('n_total', 'n_entity', 'n_tiger', 'rate_total', 'rate_entity', 'rank')
+
+# DBへまとめてINSERTする際の1回あたりの行数
+BULK_INSERT_CHUNK_SIZE = 1000
+
+# コメント分析のプロセスプール（CPUバウンドな処理を並列化、初回利用時に作成）
+ANALYSIS_CHUNK_SIZE = 2000
+ANALYSIS_POOL_WORKERS = max(1, settings.analysis_max_workers)
+_analysis_pool: Optional[ProcessPoolExecutor] = None
+_analysis_pool_lock = threading.Lock()
+
+
+def _publish_status(video_id: str, progress: CollectionProgress):
+    """Redisが使える場合は収集ステータスを書き出す（他ワーカーから参照可能にする）"""
+    if cache_manager.redis_client:
+        cache_manager.set(
+            get_collection_status_cache_key(video_id),
+            progress.model_dump(),
+            expire_seconds=COLLECTION_STATUS_TTL
+        )
+
+
+def set_collection_status(video_id: str, progress: CollectionProgress):
+    """
+    収集ステータスを更新（スレッドセーフ）
+
+    ログは現在のステータスのものを引き継ぐ（通し番号 log_start もそのまま保つ）。
+    """
     with _status_lock:
-        if video_id not in collection_locks:
-            collection_locks[video_id] = threading.Lock()
-        return collection_locks[video_id]
+        previous = collection_status.get(video_id)
+        lock = collection_locks.get(video_id)
+        if previous is not None:
+            with lock if lock is not None else nullcontext():
+                progress.logs = previous.logs
+                progress.log_start = previous.log_start
+        collection_status[video_id] = progress
+    _publish_status(video_id, progress)
 
 
 def add_log(video_id: str, level: str, message: str, emoji: str = None):
-    """ログエントリを追加（スレッドセーフ）"""
-    from datetime import datetime
+    """
+    ログエントリを追加（スレッドセーフ）
+
+    全体のロック（_status_lock）はエントリの取得と更新時刻の記録だけに使い、
+    ログへの追記は動画IDごとのロックで行う（並行する収集同士で待ち合わせない）。
+    """
+    # 画面は秒までしか表示しないためマイクロ秒は出力しない
+    log_entry = LogEntry(
+        timestamp=datetime.now().isoformat(timespec='seconds'),
+        level=level,
+        message=message,
+        emoji=emoji
+    )
     with _status_lock:
-        if video_id in collection_status:
-            log_entry = LogEntry(
-                timestamp=datetime.now().isoformat(),
-                level=level,
-                message=message,
-                emoji=emoji
-            )
-            collection_status[video_id].logs.append(log_entry)
+        progress = collection_status.get(video_id)
+        if progress is None:
+            return
+        collection_status.touch(video_id)
+        lock = collection_locks.get(video_id)
+        if lock is None:
+            lock = collection_locks[video_id] = threading.Lock()
+
+    with lock:
+        logs = progress.logs
+        logs.append(log_entry)
+        overflow = len(logs) - COLLECTION_LOG_MAX_ENTRIES
+        if overflow > 0:
+            del logs[:overflow]
+            progress.log_start += overflow
+    _publish_status(video_id, progress)
+
+
+def _logs_since(progress: CollectionProgress, since: int) -> CollectionProgress:
+    """通し番号 since 以降のログだけを含むステータスのコピーを作成"""
+    logs = progress.logs
+    start = min(max(since - progress.log_start, 0), len(logs))
+    return progress.model_copy(update={
+        'logs': logs[start:],
+        'log_start': progress.log_start + start,
+    })
+
+
+def _iter_json_array(path: str) -> Iterator[Any]:
+    """
+    JSON配列ファイルを要素ごとに読み込み
+
+    大きなファイルはijsonで逐次パースしてメモリを抑え、それ未満（またはijson未インストール時）は
+    orjsonで一括パースする（小さなファイルではこちらの方が速い）。
+    """
+    if ijson is None or os.path.getsize(path) < STREAM_PARSE_MIN_BYTES:
+        yield from load_json(path)
+        return
+    with open(path, 'rb') as f:
+        yield from ijson.items(f, 'item', use_float=True)
+
+
+def _dump_json(path: str, data: Any, indent: bool = False):
+    """
+    JSONファイルに書き込み（orjson, UTF-8）
+
+    コメント等の機械向けファイルはコンパクトに、人が読む小さなファイルのみ indent=True で整形する。
+    一時ファイルに書いてから置き換えるため、途中で落ちても書きかけのファイルは残らない。
+    """
+    option = orjson.OPT_INDENT_2 if indent else 0
+    with atomic_write(path) as f:
+        f.write(orjson.dumps(data, option=option))
+
+
+def _json_response(data: Any) -> Response:
+    """orjsonでエンコード済みのJSONレスポンスを返す（jsonable_encoderを通さない）"""
+    return Response(content=orjson.dumps(data), media_type="application/json")
+
+
+def _get_collector() -> YouTubeCollector:
+    """
+    収集ワーカースレッドごとのYouTubeCollectorを取得
+
+    APIクライアント（ディスカバリ文書の解析と接続）を収集のたびに作り直さないよう使い回す。
+    下層のhttplib2はスレッドセーフではないため、スレッド間では共有しない。
+    """
+    collector = getattr(_collector_local, 'collector', None)
+    if collector is None or collector.api_key != YOUTUBE_API_KEY:
+        collector = YouTubeCollector(YOUTUBE_API_KEY)
+        _collector_local.collector = collector
+    return collector
 
 
 def extract_video_id(url: str) -> str:
     """YouTube URLから動画IDを抽出"""
-    if "youtube.com/watch?v=" in url:
-        return url.split("v=")[1].split("&")[0]
-    elif "youtu.be/" in url:
-        return url.split("youtu.be/")[1].split("?")[0]
-    else:
-        return url
+    match = _VIDEO_ID_RE.search(url)
+    return match.group(1) if match else url
 
 
 @router.post("/collect", response_model=CollectionProgress)
-async def collect_comments(request: CollectionRequest, background_tasks: BackgroundTasks):
+def collect_comments(request: CollectionRequest):
     """
     YouTube動画のコメントを収集（バックグラウンド処理）
     """
     video_id = extract_video_id(request.video_url)
     tiger_ids = request.tiger_ids or []
 
+    comments_file = os.path.join(DATA_DIR, f"comments_{video_id}.json")
+
     # 同じ動画の同時収集をチェック
     with _status_lock:
-        if video_id in collection_status and collection_status[video_id].status == "collecting":
-            return collection_status[video_id]  # 既に収集中
+        existing = collection_status.get(video_id)
+        if existing is not None:
+            if existing.status == "collecting":
+                return existing  # 既に収集中
+
+            # 直前に完了したばかりなら再収集しない（YouTube APIクォータ節約）
+            if existing.status == "completed":
+                try:
+                    elapsed = time.time() - os.path.getmtime(comments_file)
+                except OSError:
+                    elapsed = None
+                if elapsed is not None and elapsed < RECOLLECT_COOLDOWN_SECONDS:
+                    return existing
 
         # 初期ステータスを設定
-        collection_status[video_id] = CollectionProgress(
+        progress = CollectionProgress(
             status="collecting",
             video_id=video_id,
             collected_comments=0,
             message="コメント収集を開始しました",
             logs=[]
         )
+        collection_status[video_id] = progress
+        # ワーカーがログを追記し始める前の状態を返す
+        response = progress.model_copy(deep=True)
+    _publish_status(video_id, progress)
 
-    # バックグラウンドタスクを追加（tiger_idsも渡す）
-    background_tasks.add_task(collect_comments_task, video_id, tiger_ids)
+    # 収集専用ワーカーで実行（tiger_idsも渡す）
+    _collect_executor.submit(collect_comments_task, video_id, tiger_ids)
 
-    return collection_status[video_id]
+    return response
 
 
 def collect_comments_task(video_id: str, tiger_ids: list = None):
@@ -109,17 +370,16 @@ def collect_comments_task(video_id: str, tiger_ids: list = None):
         # APIキーのチェック
         if not YOUTUBE_API_KEY:
             add_log(video_id, "error", "❌ YouTube API キーが設定されていません", "❌")
-            collection_status[video_id] = CollectionProgress(
+            set_collection_status(video_id, CollectionProgress(
                 status="error",
                 video_id=video_id,
                 collected_comments=0,
-                message="エラー: YOUTUBE_API_KEY環境変数が設定されていません",
-                logs=collection_status[video_id].logs
-            )
+                message="エラー: YOUTUBE_API_KEY環境変数が設定されていません"
+            ))
             return
 
         add_log(video_id, "info", "🔑 API キーを確認しました", "🔑")
-        collector = YouTubeCollector(YOUTUBE_API_KEY)
+        collector = _get_collector()
 
         # 動画情報を取得
         add_log(video_id, "info", "📹 動画情報を取得中...", "📹")
@@ -127,13 +387,12 @@ def collect_comments_task(video_id: str, tiger_ids: list = None):
 
         if not video_info:
             add_log(video_id, "error", "❌ 動画情報の取得に失敗しました", "❌")
-            collection_status[video_id] = CollectionProgress(
+            set_collection_status(video_id, CollectionProgress(
                 status="error",
                 video_id=video_id,
                 collected_comments=0,
-                message="エラー: 動画情報の取得に失敗しました。動画IDが正しいか確認してください",
-                logs=collection_status[video_id].logs
-            )
+                message="エラー: 動画情報の取得に失敗しました。動画IDが正しいか確認してください"
+            ))
             return
 
         add_log(video_id, "success", f"✅ 動画情報を取得: {video_info['title']}", "✅")
@@ -147,33 +406,36 @@ def collect_comments_task(video_id: str, tiger_ids: list = None):
 
         # データを保存
         add_log(video_id, "info", "💾 データを保存中...", "💾")
-        data_dir = os.path.join(os.path.dirname(__file__), "../../data")
-        os.makedirs(data_dir, exist_ok=True)
-
-        # 動画データを保存
-        videos_file = os.path.join(data_dir, "videos.json")
-        if os.path.exists(videos_file):
-            with open(videos_file, 'r', encoding='utf-8') as f:
-                videos = json.load(f)
-        else:
-            videos = []
+        os.makedirs(DATA_DIR, exist_ok=True)
 
-        # 既存の動画を更新または追加
-        existing_index = next((i for i, v in enumerate(videos) if v['video_id'] == video_id), None)
-        if existing_index is not None:
-            videos[existing_index] = video_info
-        else:
-            videos.append(video_info)
+        # 動画データを保存（並行する収集同士で読み書きが混ざらないようロック）
+        videos_file = VIDEOS_FILE
+        with _videos_file_lock:
+            # パース済みの内容はキャッシュを再利用（キャッシュ自体は変更しないようコピー）
+            if os.path.exists(videos_file):
+                videos = list(load_json_cached(videos_file))
+            else:
+                videos = []
+
+            # 既存の動画を更新または追加
+            existing_index = next((i for i, v in enumerate(videos) if v['video_id'] == video_id), None)
+            if existing_index is not None and videos[existing_index] == video_info:
+                pass  # 内容が同じなら書き直さない
+            else:
+                if existing_index is not None:
+                    videos[existing_index] = video_info
+                else:
+                    videos.append(video_info)
 
-        with open(videos_file, 'w', encoding='utf-8') as f:
-            json.dump(videos, f, ensure_ascii=False, indent=2)
+                _dump_json(videos_file, videos)
+                # 書き込んだ内容でキャッシュを更新し、次回の再パースを省く
+                store_json_cache(videos_file, videos)
 
         add_log(video_id, "success", "✅ 動画情報を保存しました", "✅")
 
         # コメントデータを保存
-        comments_file = os.path.join(data_dir, f"comments_{video_id}.json")
-        with open(comments_file, 'w', encoding='utf-8') as f:
-            json.dump(comments, f, ensure_ascii=False, indent=2)
+        comments_file = os.path.join(DATA_DIR, f"comments_{video_id}.json")
+        _dump_json(comments_file, comments)
 
         add_log(video_id, "success", "✅ コメントデータを保存しました", "✅")
 
@@ -181,38 +443,7 @@ def collect_comments_task(video_id: str, tiger_ids: list = None):
         add_log(video_id, "info", "🗄️ データベースに保存中...", "🗄️")
         db = SessionLocal()
         try:
-            # 既存の動画を確認
-            existing_video = db.query(VideoDB).filter(VideoDB.video_id == video_id).first()
-            if existing_video:
-                # 更新
-                existing_video.title = video_info.get('title', '')
-                existing_video.description = video_info.get('description', '')
-                existing_video.thumbnail_url = video_info.get('thumbnail_url', '')
-                existing_video.view_count = video_info.get('view_count', 0)
-                existing_video.like_count = video_info.get('like_count', 0)
-                existing_video.comment_count = video_info.get('comment_count', 0)
-            else:
-                # 新規作成 - published_at を datetime に変換
-                published_at_str = video_info.get('published_at')
-                published_at_dt = None
-                if published_at_str:
-                    try:
-                        # ISO 8601 形式をパース
-                        published_at_dt = datetime.fromisoformat(published_at_str.replace('Z', '+00:00'))
-                    except (ValueError, AttributeError):
-                        pass
-
-                new_video = VideoDB(
-                    video_id=video_id,
-                    title=video_info.get('title', ''),
-                    description=video_info.get('description', ''),
-                    thumbnail_url=video_info.get('thumbnail_url', ''),
-                    published_at=published_at_dt,
-                    view_count=video_info.get('view_count', 0),
-                    like_count=video_info.get('like_count', 0),
-                    comment_count=video_info.get('comment_count', 0)
-                )
-                db.add(new_video)
+            _upsert_video(db, video_id, video_info)
             db.commit()
             add_log(video_id, "success", "✅ データベースに保存しました", "✅")
 
@@ -220,22 +451,29 @@ def collect_comments_task(video_id: str, tiger_ids: list = None):
             if tiger_ids:
                 add_log(video_id, "info", "🎯 選択された出演社長をデータベースに登録中...", "🎯")
                 # 既存のVideoTiger関係を削除
-                db.query(VideoTiger).filter(VideoTiger.video_id == video_id).delete()
+                db.execute(delete(VideoTiger).where(VideoTiger.video_id == video_id))
 
-                # 選択された社長を登録
+                # 選択された社長の表示名を1回のクエリでまとめて取得
+                tiger_names = dict(
+                    db.query(TigerDB.tiger_id, TigerDB.display_name)
+                    .filter(TigerDB.tiger_id.in_(tiger_ids))
+                    .all()
+                )
+
+                # 選択された社長を登録（まとめてINSERT）
                 registered_names = []
+                video_tiger_rows = []
                 for order, tiger_id in enumerate(tiger_ids, start=1):
-                    tiger_exists = db.query(TigerDB).filter(TigerDB.tiger_id == tiger_id).first()
-                    if tiger_exists:
-                        video_tiger = VideoTiger(
-                            video_id=video_id,
-                            tiger_id=tiger_id,
-                            appearance_order=order
-                        )
-                        db.add(video_tiger)
-                        registered_names.append(tiger_exists.display_name)
+                    if tiger_id in tiger_names:
+                        video_tiger_rows.append({
+                            'video_id': video_id,
+                            'tiger_id': tiger_id,
+                            'appearance_order': order
+                        })
+                        registered_names.append(tiger_names[tiger_id])
                     else:
                         add_log(video_id, "warning", f"⚠️ 社長 {tiger_id} がマスタに存在しません", "⚠️")
+                _bulk_insert_in_chunks(db, VideoTiger, video_tiger_rows)
 
                 db.commit()
                 if registered_names:
@@ -264,44 +502,56 @@ def collect_comments_task(video_id: str, tiger_ids: list = None):
         add_log(video_id, "success", "🎉 コメント収集が完了しました！", "🎉")
 
         # ステータスを更新
-        collection_status[video_id] = CollectionProgress(
+        set_collection_status(video_id, CollectionProgress(
             status="completed",
             video_id=video_id,
             collected_comments=len(comments),
             total_comments=video_info.get('comment_count', len(comments)),
-            message=f"{len(comments)}件のコメントを収集しました",
-            logs=collection_status[video_id].logs
-        )
+            message=f"{len(comments)}件のコメントを収集しました"
+        ))
 
     except Exception as e:
         add_log(video_id, "error", f"❌ エラーが発生しました: {str(e)}", "❌")
-        collection_status[video_id] = CollectionProgress(
+        set_collection_status(video_id, CollectionProgress(
             status="error",
             video_id=video_id,
             collected_comments=0,
-            message=f"エラー: {str(e)}",
-            logs=collection_status[video_id].logs if video_id in collection_status else []
-        )
+            message=f"エラー: {str(e)}"
+        ))
 
 
 @router.get("/collect/{video_id}", response_model=CollectionProgress)
-async def get_collection_status(video_id: str):
+def get_collection_status(
+    video_id: str,
+    since: Optional[int] = Query(None, ge=0, description="指定した通し番号以降のログだけを返す（前回の log_start + len(logs)）")
+):
     """コメント収集の進捗を取得"""
     # メモリ内ステータスを確認
-    if video_id in collection_status:
-        return collection_status[video_id]
+    with _status_lock:
+        collection_status.expire()
+        progress = collection_status.get(video_id)
+        lock = collection_locks.get(video_id)
+    if progress is not None:
+        if since is None:
+            return progress
+        # 収集スレッドの追記と競合しないよう動画IDごとのロック内で切り出す
+        with lock if lock is not None else nullcontext():
+            return _logs_since(progress, since)
+
+    # 別ワーカーで収集中/収集済みの場合はRedisに残っている
+    if cache_manager.redis_client:
+        cached = cache_manager.get(get_collection_status_cache_key(video_id))
+        if cached:
+            progress = CollectionProgress(**cached)
+            return progress if since is None else _logs_since(progress, since)
 
     # メモリにない場合、ファイルが存在するか確認（収集完了済みの可能性）
-    comments_file = os.path.join(
-        os.path.dirname(__file__),
-        f"../../data/comments_{video_id}.json"
-    )
+    comments_file = os.path.join(DATA_DIR, f"comments_{video_id}.json")
 
     if os.path.exists(comments_file):
         # コメントファイルが存在 = 収集完了済み
         try:
-            with open(comments_file, 'r', encoding='utf-8') as f:
-                comments = json.load(f)
+            comments = load_json(comments_file)
             return CollectionProgress(
                 status="completed",
                 video_id=video_id,
@@ -316,92 +566,336 @@ async def get_collection_status(video_id: str):
     raise HTTPException(status_code=404, detail="Collection not found")
 
 
-@router.post("/analyze", response_model=AnalysisResult)
-async def analyze_comments(request: AnalysisRequest, db: Session = Depends(get_db)):
+def _bulk_insert_in_chunks(db: Session, model, rows, chunk_size: int = BULK_INSERT_CHUNK_SIZE):
     """
-    収集済みコメントを分析
+    行（dict）をチャンクごとにまとめてINSERT
+
+    ORMオブジェクトを作らず insert() + 行リストで実行する（insertmanyvalues による一括INSERT）。
+    行数が多くても1回の実行に載るパラメータ数を一定に保つ。
     """
-    start_time = time.time()
+    stmt = insert(model)
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            db.execute(stmt, batch)
+            batch = []
+    if batch:
+        db.execute(stmt, batch)
+
+
+def _dialect_insert(db: Session):
+    """UPSERT（ON CONFLICT DO UPDATE）に対応したinsert()を返す（非対応のDBではNone）"""
+    dialect = db.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as upsert_insert
+        return upsert_insert
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as upsert_insert
+        return upsert_insert
+    return None
+
+
+def _upsert_video(db: Session, video_id: str, video_info: dict):
+    """
+    収集した動画情報を1文のUPSERTで保存
 
-    comments = None
+    既存の動画はタイトル・概要・サムネイル・各種カウントのみ更新し、公開日時は新規作成時にだけ設定する。
+    """
+    row = {
+        'video_id': video_id,
+        'title': video_info.get('title', ''),
+        'description': video_info.get('description', ''),
+        'thumbnail_url': video_info.get('thumbnail_url', ''),
+        'view_count': video_info.get('view_count', 0),
+        'like_count': video_info.get('like_count', 0),
+        'comment_count': video_info.get('comment_count', 0)
+    }
 
-    # コメントデータを読み込み（JSONファイル優先、なければDB）
-    comments_file = os.path.join(
-        os.path.dirname(__file__),
-        f"../../data/comments_{request.video_id}.json"
+    upsert_insert = _dialect_insert(db)
+    if upsert_insert is None:
+        existing_video = db.query(VideoDB).filter(VideoDB.video_id == video_id).first()
+        if existing_video:
+            for column in VIDEO_UPSERT_COLUMNS:
+                setattr(existing_video, column, row[column])
+        else:
+            db.add(VideoDB(published_at=parse_iso_datetime_or_none(video_info.get('published_at')), **row))
+        return
+
+    stmt = upsert_insert(VideoDB).values(
+        published_at=parse_iso_datetime_or_none(video_info.get('published_at')),
+        **row
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['video_id'],
+        set_={
+            **{column: stmt.excluded[column] for column in VIDEO_UPSERT_COLUMNS},
+            'updated_at': datetime.utcnow(),
+        }
     )
+    db.execute(stmt)
 
-    if os.path.exists(comments_file):
-        # JSONファイルから読み込み
-        try:
-            with open(comments_file, 'r', encoding='utf-8') as f:
-                comments = json.load(f)
-        except json.JSONDecodeError as e:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to parse comments file: {str(e)}"
-            )
-    else:
-        # DBからコメントを取得
-        db_comments = db.query(CommentDB).filter(CommentDB.video_id == request.video_id).all()
-        if db_comments:
-            comments = [
-                {
-                    "comment_id": c.comment_id,
-                    "video_id": c.video_id,
-                    "text": c.text,
-                    "text_normalized": c.text_normalized or c.text,
-                    "author_name": c.author_name,
-                    "author_channel_id": c.author_channel_id,
-                    "like_count": c.like_count or 0,
-                    "published_at": c.published_at.isoformat() if c.published_at else None,
-                    "is_reply": c.is_reply or False,
-                    "parent_id": c.parent_id
-                }
-                for c in db_comments
-            ]
 
-    if not comments:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Comments for video {request.video_id} not found. Please collect first."
+def _upsert_video_tiger_stats(db: Session, video_id: str, rows: list):
+    """
+    動画の社長別統計をUPSERTで置き換え
+
+    今回の行に含まれない社長の統計だけを削除し、残りは INSERT ... ON CONFLICT DO UPDATE で
+    1文にまとめて書き込む（統計が一時的に空になる区間ができない）。
+    UPSERT非対応のDBでは削除してから挿入し直す。
+    """
+    upsert_insert = _dialect_insert(db)
+    if upsert_insert is None:
+        db.execute(delete(VideoTigerStats).where(VideoTigerStats.video_id == video_id))
+        _bulk_insert_in_chunks(db, VideoTigerStats, rows)
+        return
+
+    # 対象外になった社長の統計を削除
+    stale = delete(VideoTigerStats).where(VideoTigerStats.video_id == video_id)
+    if rows:
+        stale = stale.where(VideoTigerStats.tiger_id.notin_([row['tiger_id'] for row in rows]))
+    db.execute(stale)
+
+    if not rows:
+        return
+    stmt = upsert_insert(VideoTigerStats)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['video_id', 'tiger_id'],
+        set_={
+            **{column: stmt.excluded[column] for column in VIDEO_TIGER_STATS_UPSERT_COLUMNS},
+            'updated_at': datetime.utcnow(),
+        }
+    )
+    db.execute(stmt, rows)
+
+
+def _build_tiger_index(tigers: list) -> tuple:
+    """社長マスタから (tiger_id→社長, tiger_id→表示名) の索引を作成"""
+    tigers_by_id = {t['tiger_id']: t for t in tigers}
+    tiger_name_map = {tid: t.get('display_name', tid) for tid, t in tigers_by_id.items()}
+    return tigers_by_id, tiger_name_map
+
+
+def _load_tiger_index(tigers_file: str) -> tuple:
+    """社長マスタの索引を取得（tigers.jsonが更新されるまで使い回す）"""
+    return load_derived_cached(tigers_file, 'tiger_index', _build_tiger_index)
+
+
+def _analysis_cache_key(request: AnalysisRequest, comments_file: str) -> Optional[tuple]:
+    """
+    分析結果キャッシュのキー（動画ID, 社長ID列, 入力ファイルのmtime）を生成
+
+    社長IDの順序は出演順・順位に影響するため並べ替えない。
+    コメントファイルがない（DBから読む）場合はキャッシュしないのでNone。
+    """
+    try:
+        return (
+            request.video_id,
+            tuple(request.tiger_ids),
+            os.stat(comments_file).st_mtime_ns,
+            os.stat(TIGERS_FILE).st_mtime_ns,
+            os.stat(ALIASES_FILE).st_mtime_ns,
         )
+    except OSError:
+        return None
+
+
+def _output_mtimes(files: tuple) -> Optional[tuple]:
+    """書き出し済みファイルのmtime（いずれか欠けていればNone）"""
+    try:
+        return tuple(os.stat(path).st_mtime_ns for path in files)
+    except OSError:
+        return None
+
+
+def _get_cached_analysis(cache_key: Optional[tuple]) -> Optional[Dict[str, Any]]:
+    """キャッシュ済みの分析結果を取得（出力ファイルが書き換わっていればミス扱い）"""
+    if cache_key is None:
+        return None
+    with _analysis_cache_lock:
+        cached = _analysis_cache.get(cache_key)
+        if cached is None:
+            return None
+        analysis, output_mtimes = cached
+        if _output_mtimes(analysis['files']) != output_mtimes:
+            del _analysis_cache[cache_key]
+            return None
+        _analysis_cache.move_to_end(cache_key)
+        return analysis
+
+
+def _store_cached_analysis(cache_key: Optional[tuple], analysis: Dict[str, Any]):
+    """分析結果をキャッシュに保存（LRUで上限を超えた分は古い順に破棄）"""
+    if cache_key is None:
+        return
+    output_mtimes = _output_mtimes(analysis['files'])
+    if output_mtimes is None:
+        return
+    with _analysis_cache_lock:
+        _analysis_cache[cache_key] = (analysis, output_mtimes)
+        _analysis_cache.move_to_end(cache_key)
+        while len(_analysis_cache) > ANALYSIS_CACHE_MAX_ENTRIES:
+            _analysis_cache.popitem(last=False)
+
+
+def _analyze_comment_chunk(
+    chunk: list,
+    tigers_file: str,
+    aliases_file: str,
+    resolved_ids: list,
+    alias_to_requested: dict,
+    tiger_name_map: dict
+) -> list:
+    """
+    コメントのチャンクを分析し、(分析済みコメントのJSON, コメントID, 言及社長IDセット) のリストを返す
+
+    プロセスプールのワーカーからも呼ばれる。アナライザーはプロセスごとにキャッシュされる。
+    """
+    analyzer = get_comment_analyzer(tigers_file, aliases_file)
+    results = []
+    for comment in chunk:
+        result = analyzer.find_tiger_mentions(comment.get('text', ''), target_tigers=resolved_ids)
+
+        # フロントエンド期待形式に整形
+        mentions_for_ui = [
+            {
+                # analyzerのID（エイリアス側）→ リクエストID（tigers.json側）に戻す
+                'tiger_id': alias_to_requested.get(m['tiger_id'], m['tiger_id']),
+                'display_name': tiger_name_map.get(alias_to_requested.get(m['tiger_id'], ''), m['tiger_id']),
+                'matched_text': m.get('matched_alias')
+            }
+            for m in result.get('mentions', [])
+        ]
 
+        analyzed_comment = {
+            **comment,
+            # author_name がないフォーマットに対応
+            'author_name': comment.get('author_name') or comment.get('author') or '',
+            'normalized_text': result.get('normalized_text'),
+            'tiger_mentions': mentions_for_ui  # 空でもOK
+        }
+
+        if mentions_for_ui:
+            results.append((
+                orjson.dumps(analyzed_comment),
+                comment['comment_id'],
+                {m['tiger_id'] for m in mentions_for_ui}
+            ))
+        else:
+            results.append((orjson.dumps(analyzed_comment), None, None))
+    return results
+
+
+def _init_analysis_worker(tigers_file: str, aliases_file: str):
+    """
+    分析ワーカープロセスの初期化
+
+    アナライザー（エイリアスのオートマトン）を起動時に組み立てておき、
+    最初のチャンクの処理時間に構築コストが乗らないようにする。
+    """
+    try:
+        get_comment_analyzer(tigers_file, aliases_file)
+    except Exception:
+        # 失敗してもチャンク処理時に改めて構築される
+        pass
+
+
+def _get_analysis_pool() -> ProcessPoolExecutor:
+    """
+    コメント分析用のプロセスプールを取得（初回のみ作成）
+
+    収集スレッドやDB/Redisの接続プールが動いている中で作成するため、fork ではなく
+    spawn で起動する（fork だと保持中のロックを子プロセスが引き継いでデッドロックし得る）。
+    """
+    global _analysis_pool
+    with _analysis_pool_lock:
+        if _analysis_pool is None:
+            _analysis_pool = ProcessPoolExecutor(
+                max_workers=ANALYSIS_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_analysis_worker,
+                initargs=(TIGERS_FILE, ALIASES_FILE)
+            )
+        return _analysis_pool
+
+
+def _iter_analyzed_chunks(comments, chunk_args: tuple) -> Iterator[list]:
+    """
+    コメントをチャンクに分けて分析し、結果を元の順序で返す
+
+    1チャンクに満たない件数はプロセス間通信の方が高くつくためその場で処理する。
+    それ以上はプロセスプールで並列処理し、同時に投入するチャンク数を制限してメモリを抑える。
+    """
+    it = iter(comments)
+    chunk = list(islice(it, ANALYSIS_CHUNK_SIZE))
+    if len(chunk) < ANALYSIS_CHUNK_SIZE:
+        if chunk:
+            yield _analyze_comment_chunk(chunk, *chunk_args)
+        return
+
+    pool = _get_analysis_pool()
+    pending = deque()
+    try:
+        while chunk:
+            pending.append(pool.submit(_analyze_comment_chunk, chunk, *chunk_args))
+            if len(pending) >= ANALYSIS_POOL_WORKERS * 2:
+                yield pending.popleft().result()
+            chunk = list(islice(it, ANALYSIS_CHUNK_SIZE))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def shutdown_executors():
+    """
+    収集ワーカーと分析プロセスプールを停止（アプリ終了時に呼ぶ）
+
+    未着手の収集はキャンセルし、実行中のものは待たずに終了する。
+    """
+    _collect_executor.shutdown(wait=False, cancel_futures=True)
+    with _analysis_pool_lock:
+        if _analysis_pool is not None:
+            _analysis_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _analyze_and_save(request: AnalysisRequest, comments, video_title: str) -> Dict[str, Any]:
+    """
+    コメントを分析し、分析済みコメント・統計JSONを書き出す
+
+    DB永続化に必要な集計結果（stats, 件数, 言及数）を返す。
+    """
     # 社長マスタのパス
-    tigers_file = os.path.join(os.path.dirname(__file__), "../../data/tigers.json")
-    aliases_file = os.path.join(os.path.dirname(__file__), "../../data/aliases.json")
+    tigers_file = TIGERS_FILE
+    aliases_file = ALIASES_FILE
 
     # 社長データ・エイリアス読み込み（統計・表示名付与・ID解決用）
-    with open(tigers_file, 'r', encoding='utf-8') as f:
-        all_tigers = json.load(f)
-    with open(aliases_file, 'r', encoding='utf-8') as f:
-        aliases_dict = json.load(f)
-    tiger_name_map = {t['tiger_id']: t.get('display_name', t['tiger_id']) for t in all_tigers}
+    all_tigers = load_json_cached(tigers_file)
+    aliases_dict = load_json_cached(aliases_file)
+    tigers_by_id, tiger_name_map = _load_tiger_index(tigers_file)
+
+    # エイリアス文字列 → aliases.jsonのキー（aliases.jsonが更新されるまで使い回す）
+    alias_text_to_key = load_derived_cached(aliases_file, 'alias_text_index', build_alias_text_index)
 
     # 入力ID（tigers.jsonのIDかもしれない）→ エイリアス側ID（aliases.jsonのキー）に解決
     def resolve_target_ids(input_ids: list[str]) -> tuple[list[str], dict[str, str]]:
         # エイリアスに存在するものはそのまま、存在しない場合はdisplay_name/full_name一致で探索
         alias_ids: list[str] = []
         alias_to_requested: dict[str, str] = {}
-        # 検索用: display_name/full_name セット
-        display_map = {t['tiger_id']: (t.get('display_name',''), t.get('full_name','')) for t in all_tigers}
         for req_id in input_ids:
             if req_id in aliases_dict:
                 alias_ids.append(req_id)
                 alias_to_requested[req_id] = req_id
                 continue
-            dname, fname = display_map.get(req_id, ('',''))
+            # 検索用: display_name/full_name
+            tiger = tigers_by_id.get(req_id, {})
+            dname, fname = tiger.get('display_name', ''), tiger.get('full_name', '')
             matched_key = None
             if dname:
-                for k, alias_list in aliases_dict.items():
-                    if any(a.get('alias') == dname for a in alias_list):
-                        matched_key = k
-                        break
+                matched_key = alias_text_to_key.get(dname)
             if not matched_key and fname:
-                for k, alias_list in aliases_dict.items():
-                    if any(a.get('alias') == fname for a in alias_list):
-                        matched_key = k
-                        break
+                matched_key = alias_text_to_key.get(fname)
             # 見つかった場合はaliasキーを用いる、なければ元IDを使用（検出は期待薄）
             alias_key = matched_key or req_id
             alias_ids.append(alias_key)
@@ -416,260 +910,344 @@ async def analyze_comments(request: AnalysisRequest, db: Session = Depends(get_d
         return alias_ids_unique, alias_to_requested
 
     # 指定された社長のみフィルタ
-    tigers = [t for t in all_tigers if t['tiger_id'] in request.tiger_ids]
+    requested = set(request.tiger_ids)
+    tigers = [t for t in all_tigers if t['tiger_id'] in requested]
 
     # 分析実行
-    analyzer = CommentAnalyzer(tigers_file, aliases_file)
     # ID解決
     resolved_ids, alias_to_requested = resolve_target_ids(request.tiger_ids)
-    analyzed_comments = []
 
-    for comment in comments:
-        result = analyzer.find_tiger_mentions(comment.get('text', ''), target_tigers=resolved_ids)
+    # 分析済みコメントは1件ずつファイルへ書き出し、集計用の件数だけを保持する
+    analyzed_comments_file = os.path.join(DATA_DIR, f"analyzed_comments_{request.video_id}.json")
 
-        # フロントエンド期待形式に整形
-        mentions_for_ui = [
-            {
-                # analyzerのID（エイリアス側）→ リクエストID（tigers.json側）に戻す
-                'tiger_id': alias_to_requested.get(m['tiger_id'], m['tiger_id']),
-                'display_name': tiger_name_map.get(alias_to_requested.get(m['tiger_id'], ''), m['tiger_id']),
-                'matched_text': m.get('matched_alias')
-            }
-            for m in result.get('mentions', [])
-        ]
+    total_comments = 0
+    mentioned_comments = 0
+    entity_comment_ids = set()
+    tiger_counter = Counter()
 
-        analyzed_comments.append({
-            **comment,
-            # author_name がないフォーマットに対応
-            'author_name': comment.get('author_name') or comment.get('author') or '',
-            'normalized_text': result.get('normalized_text'),
-            'tiger_mentions': mentions_for_ui  # 空でもOK
-        })
+    try:
+        with atomic_write(analyzed_comments_file) as out:
+            out.write(b'[')
+            chunk_args = (tigers_file, aliases_file, resolved_ids, alias_to_requested, tiger_name_map)
+            for chunk_results in _iter_analyzed_chunks(comments, chunk_args):
+                for comment_json, comment_id, mentioned_ids in chunk_results:
+                    if total_comments:
+                        out.write(b',')
+                    out.write(b'\n')
+                    out.write(comment_json)
+                    total_comments += 1
+
+                    # 集計（1パス）
+                    if mentioned_ids:
+                        mentioned_comments += 1
+                        entity_comment_ids.add(comment_id)
+                        tiger_counter.update(mentioned_ids)
+            out.write(b'\n]')
+
+            if total_comments == 0:
+                # 書き出しを破棄して既存の分析済みファイルを残す
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Comments for video {request.video_id} not found. Please collect first."
+                )
+    except _JSON_PARSE_ERRORS as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to parse comments file: {str(e)}"
+        )
 
     # 統計集計
-    aggregator = StatsAggregator(tigers_file)
-    stats = aggregator.calculate_video_stats(
-        analyzed_comments=analyzed_comments,
+    aggregator = get_stats_aggregator(tigers_file)
+    stats = aggregator.calculate_video_stats_from_counts(
+        N_total=total_comments,
+        N_entity=len(entity_comment_ids),
+        tiger_counts=tiger_counter,
         appearing_tigers=request.tiger_ids
     )
 
-    # 動画情報を取得してtitleを追加
-    videos_file = os.path.join(os.path.dirname(__file__), "../../data/videos.json")
-    video_title = "Unknown"
-    if os.path.exists(videos_file):
-        with open(videos_file, 'r', encoding='utf-8') as f:
-            videos = json.load(f)
-            video = next((v for v in videos if v['video_id'] == request.video_id), None)
-            if video:
-                video_title = video.get('title', 'Unknown')
-
-    # 統計データを保存（フロントエンド用に変換）
+
+    # 統計データ（フロントエンド用）とVideoTigerStatsの行を1回のループで作成
+    ui_tiger_stats = []
+    stats_rows = []
+    for stat in stats['tiger_stats'].values():
+        rate_total = stat['Rate_total'] / 100  # パーセントを小数に
+        rate_entity = stat['Rate_entity'] / 100
+        ui_tiger_stats.append({
+            'tiger_id': stat['tiger_id'],
+            'display_name': stat['display_name'],
+            'mention_count': stat['N_tiger'],
+            'rate_total': rate_total,
+            'rate_entity': rate_entity,
+            'rank': stat['rank']
+        })
+        stats_rows.append({
+            'video_id': request.video_id,
+            'tiger_id': stat['tiger_id'],
+            'n_total': stats['N_total'],
+            'n_entity': stats['N_entity'],
+            'n_tiger': stat['N_tiger'],
+            'rate_total': rate_total,
+            'rate_entity': rate_entity,
+            'rank': stat.get('rank')
+        })
+
     save_stats = {
         'video_id': request.video_id,
         'title': video_title,
         'total_comments': stats['N_total'],
         'tiger_mention_comments': stats['N_entity'],
-        'tiger_stats': [
-            {
-                'tiger_id': stat['tiger_id'],
-                'display_name': stat['display_name'],
-                'mention_count': stat['N_tiger'],
-                'rate_total': stat['Rate_total'] / 100,  # パーセントを小数に
-                'rate_entity': stat['Rate_entity'] / 100,
-                'rank': stat['rank']
-            }
-            for stat in stats['tiger_stats'].values()
-        ]
+        'tiger_stats': ui_tiger_stats
     }
 
-    stats_file = os.path.join(
-        os.path.dirname(__file__),
-        f"../../data/video_stats_{request.video_id}.json"
-    )
-    with open(stats_file, 'w', encoding='utf-8') as f:
-        json.dump(save_stats, f, ensure_ascii=False, indent=2)
+    stats_file = os.path.join(DATA_DIR, f"video_stats_{request.video_id}.json")
+    _dump_json(stats_file, save_stats, indent=True)
 
-    # 分析済みコメントも保存（コメント一覧表示用）
-    analyzed_comments_file = os.path.join(
-        os.path.dirname(__file__),
-        f"../../data/analyzed_comments_{request.video_id}.json"
-    )
-    with open(analyzed_comments_file, 'w', encoding='utf-8') as f:
-        json.dump(analyzed_comments, f, ensure_ascii=False, indent=2)
+    # 言及数（解析ループで集計済み）
+    tiger_mentions = {t['tiger_id']: tiger_counter[t['tiger_id']] for t in tigers}
 
-    # ========== DB永続化（統計のみ - コメント保存は省略して高速化） ==========
-    db_warning = None  # DB永続化の警告メッセージ
+    return {
+        'stats': stats,
+        'total_comments': total_comments,
+        'mentioned_comments': mentioned_comments,
+        'tiger_mentions': tiger_mentions,
+        'stats_rows': stats_rows,
+        'files': (analyzed_comments_file, stats_file),
+    }
+
+
+def _get_video_row(db: Session, video_id: str) -> Optional[VideoDB]:
+    """DBの動画レコードを取得（DBが使えない場合はNone、分析自体は続行する）"""
     try:
-        # Video レコードの存在確認/作成
-        video_in_db = db.query(VideoDB).filter(VideoDB.video_id == request.video_id).first()
-        if not video_in_db:
-            # videos.json から補完
-            videos_file = os.path.join(os.path.dirname(__file__), "../../data/videos.json")
-            video_meta = None
-            if os.path.exists(videos_file):
-                with open(videos_file, 'r', encoding='utf-8') as f:
-                    vids = json.load(f)
-                    video_meta = next((v for v in vids if v['video_id'] == request.video_id), None)
-            video_in_db = VideoDB(
-                video_id=request.video_id,
-                title=(video_meta or {}).get('title', video_title),
-                description=(video_meta or {}).get('description', ''),
-                channel_id=(video_meta or {}).get('channel_id', ''),
-                channel_title=(video_meta or {}).get('channel_title', ''),
-                published_at=datetime.fromisoformat((video_meta or {}).get('published_at', '1970-01-01T00:00:00+00:00').replace('Z', '+00:00')) if (video_meta and video_meta.get('published_at')) else None,
-                view_count=(video_meta or {}).get('view_count', 0),
-                like_count=(video_meta or {}).get('like_count', 0),
-                comment_count=len(comments),  # 実際に取得したコメント数を使用
-                thumbnail_url=(video_meta or {}).get('thumbnail_url', '')
-            )
-            db.add(video_in_db)
-            db.flush()
+        return db.query(VideoDB).filter(VideoDB.video_id == video_id).first()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.warning(f"[analyze] Video lookup failed: {e}")
+        return None
+
+
+def _find_video_meta(video_id: str) -> Optional[dict]:
+    """videos.json から動画情報を取得（なければNone）"""
+    if not os.path.exists(VIDEOS_FILE):
+        return None
+    return load_videos_by_id(VIDEOS_FILE).get(video_id)
+
+
+@router.post("/analyze", response_model=AnalysisResult)
+def analyze_comments(request: AnalysisRequest, db: Session = Depends(get_db)):
+    """
+    収集済みコメントを分析
+    """
+    start_time = time.time()
+
+    # 動画情報（DBに登録済みならDBの行を使い、videos.json は未登録の場合のみ参照）
+    video_in_db = _get_video_row(db, request.video_id)
+    video_meta = _find_video_meta(request.video_id) if video_in_db is None else None
+    if video_in_db is not None:
+        video_title = video_in_db.title
+    else:
+        video_title = (video_meta or {}).get('title', 'Unknown')
+
+    # コメントデータを読み込み（JSONファイル優先、なければDB）
+    comments_file = os.path.join(DATA_DIR, f"comments_{request.video_id}.json")
+
+    # 入力ファイルが前回分析時から変わっていなければ、分析・ファイル書き出しを省略
+    cache_key = _analysis_cache_key(request, comments_file)
+    analysis = _get_cached_analysis(cache_key)
+
+    if analysis is None:
+        if os.path.exists(comments_file):
+            # JSONファイルから1件ずつ読み込み（全件をメモリに載せない）
+            comments = _iter_json_array(comments_file)
         else:
-            # 既存のVideoがある場合、コメント数を実際の数で更新
-            video_in_db.comment_count = len(comments)
+            # DBからコメントを取得
+            db_comments = db.query(CommentDB).filter(CommentDB.video_id == request.video_id).all()
+            comments = [
+                {
+                    "comment_id": c.comment_id,
+                    "video_id": c.video_id,
+                    "text": c.text,
+                    "text_normalized": c.text_normalized or c.text,
+                    "author_name": c.author_name,
+                    "author_channel_id": c.author_channel_id,
+                    "like_count": c.like_count or 0,
+                    "published_at": c.published_at.isoformat() if c.published_at else None,
+                    "is_reply": c.is_reply or False,
+                    "parent_id": c.parent_id
+                }
+                for c in db_comments
+            ]
 
-        # ========== VideoTiger 登録 ==========
-        # 既存のVideoTiger関係を削除
-        db.query(VideoTiger).filter(VideoTiger.video_id == request.video_id).delete()
+        analysis = _analyze_and_save(request, comments, video_title)
+        if os.path.exists(comments_file):
+            _store_cached_analysis(cache_key, analysis)
 
-        # 社長IDセットを事前に取得（クエリ回数削減）
-        all_tiger_ids = {t.tiger_id for t in db.query(TigerDB.tiger_id).all()}
+    stats = analysis['stats']
+    total_comments = analysis['total_comments']
+    mentioned_comments = analysis['mentioned_comments']
+    tiger_mentions = analysis['tiger_mentions']
 
-        # 出演社長を登録（DBに存在する社長のみ）
-        for order, tiger_id in enumerate(request.tiger_ids, start=1):
-            if tiger_id in all_tiger_ids:
-                video_tiger = VideoTiger(
+    # ========== DB永続化（統計のみ - コメント保存は省略して高速化） ==========
+    db_warning = None  # DB永続化の警告メッセージ
+    try:
+        # 1トランザクションで書き込み、最後に1回だけcommitする
+        # （途中のクエリで暗黙のflushが挟まらないようautoflushを止める）
+        with db.no_autoflush:
+            # Video レコードの作成（未登録の場合）
+            if video_in_db is None:
+                # videos.json から補完
+                # 後続のINSERTより先に実行されるよう、ORMのflushを待たずに直接INSERT
+                db.execute(insert(VideoDB).values(
                     video_id=request.video_id,
-                    tiger_id=tiger_id,
-                    appearance_order=order
-                )
-                db.add(video_tiger)
+                    title=(video_meta or {}).get('title', video_title),
+                    description=(video_meta or {}).get('description', ''),
+                    channel_id=(video_meta or {}).get('channel_id', ''),
+                    channel_title=(video_meta or {}).get('channel_title', ''),
+                    published_at=parse_iso_datetime_or_none((video_meta or {}).get('published_at')),
+                    view_count=(video_meta or {}).get('view_count', 0),
+                    like_count=(video_meta or {}).get('like_count', 0),
+                    comment_count=total_comments,  # 実際に取得したコメント数を使用
+                    thumbnail_url=(video_meta or {}).get('thumbnail_url', '')
+                ))
             else:
-                print(f"[analyze] Warning: Tiger {tiger_id} not found in DB, skipping VideoTiger registration")
-
-        # VideoTigerStats を更新（統計情報のみDB保存）
-        N_total = stats['N_total']
-        N_entity = stats['N_entity']
-        # いったんこの動画の統計を削除してから再作成
-        db.query(VideoTigerStats).filter(VideoTigerStats.video_id == request.video_id).delete()
-        # 順位付与済みstatsから生成
-        ss = list(stats['tiger_stats'].values())
-        for s in ss:
-            if s['tiger_id'] not in all_tiger_ids:
-                print(f"[analyze] Warning: Tiger {s['tiger_id']} not found in DB, skipping VideoTigerStats")
-                continue
-            db.add(VideoTigerStats(
-                video_id=request.video_id,
-                tiger_id=s['tiger_id'],
-                n_total=N_total,
-                n_entity=N_entity,
-                n_tiger=s['N_tiger'],
-                rate_total=(s['Rate_total'] / 100.0 if s['Rate_total'] else 0.0),
-                rate_entity=(s['Rate_entity'] / 100.0 if s['Rate_entity'] else 0.0),
-                rank=s.get('rank')
-            ))
+                # 既存のVideoがある場合、コメント数を実際の数で更新
+                video_in_db.comment_count = total_comments
+
+            # ========== VideoTiger 登録 ==========
+            # 既存のVideoTiger関係を削除
+            db.execute(delete(VideoTiger).where(VideoTiger.video_id == request.video_id))
+
+            # 今回登録する社長のうちDBに存在するIDを1回のクエリで取得
+            referenced_tiger_ids = set(request.tiger_ids)
+            referenced_tiger_ids.update(s['tiger_id'] for s in stats['tiger_stats'].values())
+            all_tiger_ids = {
+                tiger_id for (tiger_id,) in
+                db.query(TigerDB.tiger_id).filter(TigerDB.tiger_id.in_(referenced_tiger_ids)).all()
+            }
+
+            # 出演社長を登録（DBに存在する社長のみ、まとめてINSERT）
+            video_tiger_rows = []
+            for order, tiger_id in enumerate(request.tiger_ids, start=1):
+                if tiger_id in all_tiger_ids:
+                    video_tiger_rows.append({
+                        'video_id': request.video_id,
+                        'tiger_id': tiger_id,
+                        'appearance_order': order
+                    })
+                else:
+                    logger.warning(f"[analyze] Tiger {tiger_id} not found in DB, skipping VideoTiger registration")
+            _bulk_insert_in_chunks(db, VideoTiger, video_tiger_rows)
+
+            # VideoTigerStats を更新（統計情報のみDB保存）
+            # 分析時に作成済みの行を使う（既存行は更新、今回の対象外になった行は削除）
+            stats_rows = []
+            for row in analysis['stats_rows']:
+                if row['tiger_id'] not in all_tiger_ids:
+                    logger.warning(f"[analyze] Tiger {row['tiger_id']} not found in DB, skipping VideoTigerStats")
+                    continue
+                stats_rows.append(row)
+            _upsert_video_tiger_stats(db, request.video_id, stats_rows)
 
         db.commit()
-        print(f"[analyze] DB persistence successful for video {request.video_id}")
+        logger.info(f"[analyze] DB persistence successful for video {request.video_id}")
     except Exception as e:
         # DBへの永続化失敗：ロールバックして警告を記録
         db.rollback()
-        import traceback
-        error_detail = f"{e}\n{traceback.format_exc()}"
-        print(f"[analyze] DB persistence failed: {error_detail}")
+        logger.error(f"[analyze] DB persistence failed: {e}", exc_info=True)
         db_warning = f"DB永続化に失敗しました: {str(e)}"
 
     processing_time = time.time() - start_time
 
-    # 言及数を集計
-    tiger_mentions = {}
-    for t in tigers:
-        count = sum(
-            1 for c in analyzed_comments
-            if any(m['tiger_id'] == t['tiger_id'] for m in c['tiger_mentions'])
-        )
-        tiger_mentions[t['tiger_id']] = count
-
     return AnalysisResult(
         video_id=request.video_id,
-        total_comments=len(comments),
-        analyzed_comments=len([c for c in analyzed_comments if c['tiger_mentions']]),
+        total_comments=total_comments,
+        analyzed_comments=mentioned_comments,
         tiger_mentions=tiger_mentions,
         processing_time=processing_time
     )
 
 
 @router.get("/comments/{video_id}")
-async def get_analyzed_comments(video_id: str, tiger_id: str = None):
+def get_analyzed_comments(video_id: str, tiger_id: str = None):
     """
     分析済みコメントを取得（オプションで社長IDでフィルタ）
     ファイルが存在しない場合は空配列を返す
+
+    コメント数が多く巨大になりうるため、ファイルを1件ずつ読みながらJSON配列として逐次返す。
     """
-    analyzed_comments_file = os.path.join(
-        os.path.dirname(__file__),
-        f"../../data/analyzed_comments_{video_id}.json"
-    )
+    analyzed_comments_file = os.path.join(DATA_DIR, f"analyzed_comments_{video_id}.json")
 
     if not os.path.exists(analyzed_comments_file):
         # ファイルがない場合は空配列を返す（再分析が必要）
-        return []
-
-    with open(analyzed_comments_file, 'r', encoding='utf-8') as f:
-        analyzed_comments = json.load(f)
+        return _json_response([])
 
     # 最新のtigers.jsonからdisplay_nameを取得
-    tigers_path = os.path.join(os.path.dirname(__file__), "../../data/tigers.json")
     tiger_name_map = {}
     try:
-        with open(tigers_path, 'r', encoding='utf-8') as f:
-            tigers_data = json.load(f)
-        tiger_name_map = {t['tiger_id']: t['display_name'] for t in tigers_data}
+        _, tiger_name_map = _load_tiger_index(TIGERS_FILE)
     except FileNotFoundError:
         pass
 
-    # tiger_mentionsのdisplay_nameを最新に更新
-    for comment in analyzed_comments:
-        for mention in comment.get('tiger_mentions', []):
-            if mention['tiger_id'] in tiger_name_map:
-                mention['display_name'] = tiger_name_map[mention['tiger_id']]
-
-    # 社長IDでフィルタ
-    if tiger_id:
-        filtered_comments = [
-            c for c in analyzed_comments
-            if any(m['tiger_id'] == tiger_id for m in c.get('tiger_mentions', []))
-        ]
-        return filtered_comments
+    def generate() -> Iterator[bytes]:
+        # 1件ごとではなく、ある程度まとめてから送る（送信回数を減らす）
+        buffer = bytearray(b'[')
+        first = True
+        for comment in _iter_json_array(analyzed_comments_file):
+            mentions = comment.get('tiger_mentions', [])
+            # 言及があるコメントのみ（社長ID指定時はその社長への言及があるもののみ）
+            if not mentions:
+                continue
+            if tiger_id and not any(m['tiger_id'] == tiger_id for m in mentions):
+                continue
+
+            # tiger_mentionsのdisplay_nameを最新に更新
+            for mention in mentions:
+                if mention['tiger_id'] in tiger_name_map:
+                    mention['display_name'] = tiger_name_map[mention['tiger_id']]
 
-    # 言及があるコメントのみ返す
-    return [c for c in analyzed_comments if c.get('tiger_mentions')]
+            if not first:
+                buffer += b','
+            first = False
+            buffer += orjson.dumps(comment)
+            if len(buffer) >= STREAM_CHUNK_BYTES:
+                yield bytes(buffer)
+                buffer.clear()
+        buffer += b']'
+        yield bytes(buffer)
+
+    return StreamingResponse(generate(), media_type="application/json")
 
 
 @router.get("/video-tigers/{video_id}")
-async def get_video_tigers(video_id: str, db: Session = Depends(get_db)):
+def get_video_tigers(video_id: str, db: Session = Depends(get_db)):
     """
     動画に登録済みの社長一覧を取得
     """
-    video_tigers = db.query(VideoTiger).filter(VideoTiger.video_id == video_id).order_by(VideoTiger.appearance_order).all()
-
-    if not video_tigers:
+    # 社長情報を1回のJOINで取得（マスタにない社長の行も登録有無の判定には使うため外部結合）
+    rows = db.query(
+        VideoTiger.appearance_order,
+        TigerDB.tiger_id,
+        TigerDB.display_name,
+        TigerDB.full_name,
+        TigerDB.image_url
+    ).outerjoin(
+        TigerDB, TigerDB.tiger_id == VideoTiger.tiger_id
+    ).filter(
+        VideoTiger.video_id == video_id
+    ).order_by(VideoTiger.appearance_order).all()
+
+    if not rows:
         return {"video_id": video_id, "tigers": [], "has_registered": False}
 
-    # 社長情報を取得
-    tiger_ids = [vt.tiger_id for vt in video_tigers]
-    tigers_db = db.query(TigerDB).filter(TigerDB.tiger_id.in_(tiger_ids)).all()
-    tiger_map = {t.tiger_id: t for t in tigers_db}
-
-    tigers = []
-    for vt in video_tigers:
-        tiger = tiger_map.get(vt.tiger_id)
-        if tiger:
-            tigers.append({
-                "tiger_id": tiger.tiger_id,
-                "display_name": tiger.display_name,
-                "full_name": tiger.full_name,
-                "image_url": tiger.image_url,
-                "appearance_order": vt.appearance_order
-            })
+    tigers = [
+        {
+            "tiger_id": tiger_id,
+            "display_name": display_name,
+            "full_name": full_name,
+            "image_url": image_url,
+            "appearance_order": appearance_order
+        }
+        for appearance_order, tiger_id, display_name, full_name, image_url in rows
+        if tiger_id is not None
+    ]
 
     return {"video_id": video_id, "tigers": tigers, "has_registered": True}
@@ -11,7 +11,7 @@ from models import get_db, User
 from core import (
     settings,
     create_access_token,
-    verify_password,
+    authenticate_password,
     get_password_hash
 )
 from ..schemas import Token, UserCreate, UserResponse
@@ -19,16 +19,17 @@ from ..schemas import Token, UserCreate, UserResponse
 router = APIRouter()
 
 @router.post("/login", response_model=Token)
-async def login(
+def login(
     db: Session = Depends(get_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     ユーザーログイン
     """
-    # ユーザーの検証
+    # ユーザーの検証（ユーザーが存在しない場合も同程度の時間をかける）
     user = db.query(User).filter(User.username == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    hashed_password = user.hashed_password if user else None
+    if not authenticate_password(form_data.username, form_data.password, hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="ユーザー名またはパスワードが正しくありません",
@@ -53,7 +54,7 @@ async def login(
     }
 
 @router.post("/register", response_model=UserResponse)
-async def register(
+def register(
     user_in: UserCreate,
     db: Session = Depends(get_db)
 ) -> Any:
@@ -93,7 +94,7 @@ async def register(
     return db_user
 
 @router.post("/test-token")
-async def test_token(token: str) -> Any:
+def test_token(token: str) -> Any:
     """
     トークンのテスト（デバッグ用）
     """
@@ -4,24 +4,84 @@
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import case, func
 from typing import List, Optional
+from collections import defaultdict
+from types import SimpleNamespace
+import heapq
 from datetime import datetime, timedelta
 from pydantic import BaseModel
 
 from models import get_db, Video, Comment, VideoTigerStats, Tiger, CommentTigerRelation
-from core.cache import cache_manager
+from core.cache import (
+    cache_manager,
+    get_tiger_comparison_cache_key,
+    get_video_comparison_cache_key,
+)
 from ..dependencies import get_current_user_optional
 
 router = APIRouter()
 
+# 動画比較・社長比較の結果をキャッシュする秒数
+COMPARISON_CACHE_SECONDS = 600
+
+
+def _comparison_cache_enabled() -> bool:
+    """
+    動画比較・社長比較の結果をキャッシュするか
+
+    キーはリクエストで任意に組み合わせられるため、期限切れのエントリが削除されない
+    インメモリキャッシュでは件数が際限なく増える。Redisがある場合のみキャッシュする。
+    """
+    return cache_manager.redis_client is not None
+
+# 対象の動画が1本もない社長の集計結果（集計関数が行を返さない場合と同じ値）
+_EMPTY_PERIOD_STATS = SimpleNamespace(
+    video_count=0, total_mentions=None, avg_rate_total=None, avg_rate_entity=None, avg_rank=None
+)
+
 
 class VideoComparisonRequest(BaseModel):
     video_ids: List[str]
 
 
-@router.post("/videos")
-async def compare_videos(
+class TopTigerItem(BaseModel):
+    """動画内の上位社長"""
+    tiger_id: str
+    display_name: str
+    mentions: int
+    rate_total: float
+
+
+class VideoComparisonItem(BaseModel):
+    """比較対象の動画（見つからない場合は video_id と error のみ）"""
+    video_id: str
+    error: Optional[str] = None
+    title: Optional[str] = None
+    published_at: Optional[str] = None
+    view_count: Optional[int] = None
+    comment_count: Optional[int] = None
+    top_tigers: Optional[List[TopTigerItem]] = None
+
+
+class VideoComparisonSummary(BaseModel):
+    """比較対象の動画全体のサマリー（有効な動画がなければ空）"""
+    avg_view_count: Optional[float] = None
+    avg_comment_count: Optional[float] = None
+    total_views: Optional[int] = None
+    total_comments: Optional[int] = None
+
+
+class VideoComparisonResponse(BaseModel):
+    """動画比較の結果"""
+    videos: List[VideoComparisonItem]
+    summary: VideoComparisonSummary
+    compared_at: str
+
+
+# 返した辞書にないキーは出力しない（エラーの動画や空のサマリーを従来どおりの形で返す）
+@router.post("/videos", response_model=VideoComparisonResponse, response_model_exclude_unset=True)
+def compare_videos(
     request: VideoComparisonRequest,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user_optional)
@@ -37,11 +97,40 @@ async def compare_videos(
             detail="一度に比較できる動画は10個までです"
         )
 
+    # キャッシュチェック
+    use_cache = _comparison_cache_enabled()
+    cache_key = get_video_comparison_cache_key(video_ids)
+    if use_cache:
+        cached = cache_manager.get(cache_key)
+        if cached:
+            return cached
+
+    # 動画・統計・社長をそれぞれ1回のクエリでまとめて取得
+    videos = {
+        video.video_id: video
+        for video in db.query(
+            Video.video_id, Video.title, Video.published_at, Video.view_count, Video.comment_count
+        ).filter(Video.video_id.in_(video_ids)).all()
+    }
+    stats_by_video = defaultdict(list)
+    for stat in db.query(VideoTigerStats).filter(VideoTigerStats.video_id.in_(videos.keys())).all():
+        stats_by_video[stat.video_id].append(stat)
+
+    # 上位3社長（動画ごと）
+    top_stats_by_video = {
+        video_id: heapq.nlargest(3, stats, key=lambda x: x.n_tiger)
+        for video_id, stats in stats_by_video.items()
+    }
+    top_tiger_ids = {stat.tiger_id for stats in top_stats_by_video.values() for stat in stats}
+    tiger_names = dict(
+        db.query(Tiger.tiger_id, Tiger.display_name).filter(Tiger.tiger_id.in_(top_tiger_ids)).all()
+    ) if top_tiger_ids else {}
+
     comparison_results = []
 
     for video_id in video_ids:
         # 動画情報を取得
-        video = db.query(Video).filter(Video.video_id == video_id).first()
+        video = videos.get(video_id)
         if not video:
             comparison_results.append({
                 "video_id": video_id,
@@ -49,19 +138,14 @@ async def compare_videos(
             })
             continue
 
-        # 統計情報を取得
-        stats = db.query(VideoTigerStats).filter(
-            VideoTigerStats.video_id == video_id
-        ).all()
-
         # 上位3社長を取得
         top_tigers = []
-        for stat in sorted(stats, key=lambda x: x.n_tiger, reverse=True)[:3]:
-            tiger = db.query(Tiger).filter(Tiger.tiger_id == stat.tiger_id).first()
-            if tiger:
+        for stat in top_stats_by_video.get(video_id, []):
+            display_name = tiger_names.get(stat.tiger_id)
+            if display_name is not None:
                 top_tigers.append({
                     "tiger_id": stat.tiger_id,
-                    "display_name": tiger.display_name,
+                    "display_name": display_name,
                     "mentions": stat.n_tiger,
                     "rate_total": round(stat.rate_total * 100, 2)
                 })
@@ -78,24 +162,33 @@ async def compare_videos(
     # メトリクスのサマリー
     valid_results = [r for r in comparison_results if "error" not in r]
     if valid_results:
+        # 合計は1回ずつだけ計算し、平均はそこから求める
+        total_views = sum(r["view_count"] for r in valid_results)
+        total_comments = sum(r["comment_count"] for r in valid_results)
         summary = {
-            "avg_view_count": sum(r["view_count"] for r in valid_results) / len(valid_results),
-            "avg_comment_count": sum(r["comment_count"] for r in valid_results) / len(valid_results),
-            "total_views": sum(r["view_count"] for r in valid_results),
-            "total_comments": sum(r["comment_count"] for r in valid_results)
+            "avg_view_count": total_views / len(valid_results),
+            "avg_comment_count": total_comments / len(valid_results),
+            "total_views": total_views,
+            "total_comments": total_comments
         }
     else:
         summary = {}
 
-    return {
+    response = {
         "videos": comparison_results,
         "summary": summary,
         "compared_at": datetime.now().isoformat()
     }
 
+    # キャッシュに保存（10分）
+    if use_cache:
+        cache_manager.set(cache_key, response, expire_seconds=COMPARISON_CACHE_SECONDS)
+
+    return response
+
 
 @router.get("/tigers/performance")
-async def compare_tiger_performance(
+def compare_tiger_performance(
     tiger_ids: str = Query(..., description="カンマ区切りの社長ID"),
     period_days: int = Query(30, description="比較期間（日数）"),
     db: Session = Depends(get_db),
@@ -111,24 +204,26 @@ async def compare_tiger_performance(
             detail="一度に比較できる社長は10人までです"
         )
 
+    # キャッシュチェック
+    use_cache = _comparison_cache_enabled()
+    cache_key = get_tiger_comparison_cache_key(period_days, tiger_id_list)
+    if use_cache:
+        cached = cache_manager.get(cache_key)
+        if cached:
+            return cached
+
     # 期間の計算
     end_date = datetime.now()
     start_date = end_date - timedelta(days=period_days)
 
-    comparison_results = []
-
-    for tiger_id in tiger_id_list:
-        # 社長情報を取得
-        tiger = db.query(Tiger).filter(Tiger.tiger_id == tiger_id).first()
-        if not tiger:
-            comparison_results.append({
-                "tiger_id": tiger_id,
-                "error": "社長が見つかりません"
-            })
-            continue
-
-        # 期間内の統計を集計
-        stats_query = db.query(
+    # 社長情報と期間内の統計を、対象社長の分まとめて取得
+    tiger_names = dict(
+        db.query(Tiger.tiger_id, Tiger.display_name).filter(Tiger.tiger_id.in_(tiger_id_list)).all()
+    )
+    period_stats = {
+        row.tiger_id: row
+        for row in db.query(
+            VideoTigerStats.tiger_id,
             func.count(VideoTigerStats.video_id).label("video_count"),
             func.sum(VideoTigerStats.n_tiger).label("total_mentions"),
             func.avg(VideoTigerStats.rate_total).label("avg_rate_total"),
@@ -137,14 +232,30 @@ async def compare_tiger_performance(
         ).join(
             Video, VideoTigerStats.video_id == Video.video_id
         ).filter(
-            VideoTigerStats.tiger_id == tiger_id,
+            VideoTigerStats.tiger_id.in_(tiger_names.keys()),
             Video.published_at >= start_date,
             Video.published_at <= end_date
-        ).first()
+        ).group_by(VideoTigerStats.tiger_id).all()
+    } if tiger_names else {}
+
+    comparison_results = []
+
+    for tiger_id in tiger_id_list:
+        # 社長情報を取得
+        display_name = tiger_names.get(tiger_id)
+        if display_name is None:
+            comparison_results.append({
+                "tiger_id": tiger_id,
+                "error": "社長が見つかりません"
+            })
+            continue
+
+        # 期間内の統計（該当する動画がなければ空の集計結果）
+        stats_query = period_stats.get(tiger_id, _EMPTY_PERIOD_STATS)
 
         comparison_results.append({
             "tiger_id": tiger_id,
-            "display_name": tiger.display_name,
+            "display_name": display_name,
             "metrics": {
                 "video_count": stats_query.video_count or 0,
                 "total_mentions": stats_query.total_mentions or 0,
@@ -176,17 +287,24 @@ async def compare_tiger_performance(
     for i, result in enumerate(valid_results, 1):
         result["rank"] = i
 
-    return {
+    compared_at = end_date.isoformat()
+    response = {
         "period_days": period_days,
         "start_date": start_date.isoformat(),
-        "end_date": end_date.isoformat(),
+        "end_date": compared_at,
         "tigers": comparison_results,
-        "compared_at": datetime.now().isoformat()
+        "compared_at": compared_at
     }
 
+    # キャッシュに保存（10分）
+    if use_cache:
+        cache_manager.set(cache_key, response, expire_seconds=COMPARISON_CACHE_SECONDS)
+
+    return response
+
 
 @router.get("/periods")
-async def compare_periods(
+def compare_periods(
     tiger_id: str,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user_optional)
@@ -195,7 +313,7 @@ async def compare_periods(
     同じ社長の異なる期間のパフォーマンスを比較
     """
     # 社長の存在確認
-    tiger = db.query(Tiger).filter(Tiger.tiger_id == tiger_id).first()
+    tiger = db.query(Tiger.display_name).filter(Tiger.tiger_id == tiger_id).first()
     if not tiger:
         raise HTTPException(status_code=404, detail="社長が見つかりません")
 
@@ -207,25 +325,37 @@ async def compare_periods(
         {"label": "直近6ヶ月", "days": 180}
     ]
 
-    period_results = []
     end_date = datetime.now()
+    start_dates = [end_date - timedelta(days=period["days"]) for period in periods]
+
+    # 最も長い期間を1回だけ走査し、各期間の集計はCASE式で振り分ける（期間ごとに4列）
+    columns = []
+    for start_date in start_dates:
+        in_period = Video.published_at >= start_date
+        columns += [
+            func.count(case((in_period, VideoTigerStats.video_id))),
+            func.sum(case((in_period, VideoTigerStats.n_tiger))),
+            func.avg(case((in_period, VideoTigerStats.rate_total))),
+            func.avg(case((in_period, VideoTigerStats.rate_entity)))
+        ]
+    aggregates = db.query(*columns).select_from(VideoTigerStats).join(
+        Video, VideoTigerStats.video_id == Video.video_id
+    ).filter(
+        VideoTigerStats.tiger_id == tiger_id,
+        Video.published_at >= min(start_dates),
+        Video.published_at <= end_date
+    ).one()
 
-    for period in periods:
-        start_date = end_date - timedelta(days=period["days"])
+    period_results = []
 
-        # 期間内の統計を集計
-        stats = db.query(
-            func.count(VideoTigerStats.video_id).label("video_count"),
-            func.sum(VideoTigerStats.n_tiger).label("total_mentions"),
-            func.avg(VideoTigerStats.rate_total).label("avg_rate_total"),
-            func.avg(VideoTigerStats.rate_entity).label("avg_rate_entity")
-        ).join(
-            Video, VideoTigerStats.video_id == Video.video_id
-        ).filter(
-            VideoTigerStats.tiger_id == tiger_id,
-            Video.published_at >= start_date,
-            Video.published_at <= end_date
-        ).first()
+    for i, period in enumerate(periods):
+        # 期間内の統計
+        stats = SimpleNamespace(
+            video_count=aggregates[4 * i],
+            total_mentions=aggregates[4 * i + 1],
+            avg_rate_total=aggregates[4 * i + 2],
+            avg_rate_entity=aggregates[4 * i + 3]
+        )
 
         # 成長率を計算（前期間との比較）
         growth_rate = 0
@@ -250,12 +380,12 @@ async def compare_periods(
         "tiger_id": tiger_id,
         "display_name": tiger.display_name,
         "periods": period_results,
-        "compared_at": datetime.now().isoformat()
+        "compared_at": end_date.isoformat()
     }
 
 
 @router.get("/trending")
-async def get_trending_comparison(
+def get_trending_comparison(
     db: Session = Depends(get_db),
     hours: int = Query(24, description="トレンド計算の時間範囲"),
     current_user=Depends(get_current_user_optional)
@@ -275,32 +405,27 @@ async def get_trending_comparison(
     previous_start = current_start - timedelta(hours=hours)
 
     # 全社長のリストを取得
-    tigers = db.query(Tiger).filter(Tiger.is_active == True).all()
-
-    trending_data = []
-
-    for tiger in tigers:
-        # 現在期間の言及数
-        current_mentions = db.query(
-            func.count(CommentTigerRelation.comment_id)
+    tigers = db.query(Tiger.tiger_id, Tiger.display_name).filter(Tiger.is_active == True).all()
+
+    # 現在期間・前期間の言及数を社長ごとに1回のクエリで集計
+    mention_counts = {
+        tiger_id: (int(current or 0), int(previous or 0))
+        for tiger_id, current, previous in db.query(
+            CommentTigerRelation.tiger_id,
+            func.sum(case((Comment.published_at >= current_start, 1), else_=0)),
+            func.sum(case((Comment.published_at < current_start, 1), else_=0))
         ).join(
             Comment, CommentTigerRelation.comment_id == Comment.comment_id
         ).filter(
-            CommentTigerRelation.tiger_id == tiger.tiger_id,
-            Comment.published_at >= current_start,
+            Comment.published_at >= previous_start,
             Comment.published_at <= now
-        ).scalar() or 0
+        ).group_by(CommentTigerRelation.tiger_id).all()
+    }
 
-        # 前期間の言及数
-        previous_mentions = db.query(
-            func.count(CommentTigerRelation.comment_id)
-        ).join(
-            Comment, CommentTigerRelation.comment_id == Comment.comment_id
-        ).filter(
-            CommentTigerRelation.tiger_id == tiger.tiger_id,
-            Comment.published_at >= previous_start,
-            Comment.published_at < current_start
-        ).scalar() or 0
+    trending_data = []
+
+    for tiger in tigers:
+        current_mentions, previous_mentions = mention_counts.get(tiger.tiger_id, (0, 0))
 
         # 成長率を計算
         if previous_mentions > 0:
@@ -332,7 +457,7 @@ async def get_trending_comparison(
         "top_trending": top_trending,
         "declining": declining,
         "total_analyzed": len(trending_data),
-        "generated_at": datetime.now().isoformat()
+        "generated_at": now.isoformat()
     }
 
     # キャッシュに保存（30分）
@@ -3,7 +3,8 @@
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func
 from typing import Optional
 from datetime import datetime, timedelta
 
@@ -21,9 +22,22 @@ from utils.mention_aggregator import aggregate_mentions
 
 router = APIRouter()
 
+# Excel出力時にDBから1回に取り出す行数
+EXPORT_YIELD_PER = 1000
+
+
+def _get_tiger_names(db: Session, tiger_ids) -> dict:
+    """社長ID → 表示名 の辞書を1回のクエリで取得（未登録のIDは含まれない）"""
+    tiger_ids = list(tiger_ids)
+    if not tiger_ids:
+        return {}
+    return dict(
+        db.query(Tiger.tiger_id, Tiger.display_name).filter(Tiger.tiger_id.in_(tiger_ids)).all()
+    )
+
 
 @router.get("/video/{video_id}/csv")
-async def export_video_csv(
+def export_video_csv(
     video_id: str,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user_optional)
@@ -32,7 +46,7 @@ async def export_video_csv(
     動画の統計データをCSV形式でエクスポート
     """
     # 動画の存在確認
-    video = db.query(Video).filter(Video.video_id == video_id).first()
+    video = db.query(Video.video_id, Video.title, Video.comment_count).filter(Video.video_id == video_id).first()
     if not video:
         raise HTTPException(status_code=404, detail="動画が見つかりません")
 
@@ -44,13 +58,13 @@ async def export_video_csv(
     if not stats:
         raise HTTPException(status_code=404, detail="統計データが見つかりません")
 
-    # データを整形
+    # データを整形（社長名は1回のクエリでまとめて取得）
+    tiger_names = _get_tiger_names(db, {stat.tiger_id for stat in stats})
     tiger_stats = []
     for stat in stats:
-        tiger = db.query(Tiger).filter(Tiger.tiger_id == stat.tiger_id).first()
         tiger_stats.append({
             "tiger_id": stat.tiger_id,
-            "display_name": tiger.display_name if tiger else "Unknown",
+            "display_name": tiger_names.get(stat.tiger_id, "Unknown"),
             "mention_count": stat.n_tiger,
             "rate_total": stat.rate_total,
             "rate_entity": stat.rate_entity,
@@ -69,7 +83,7 @@ async def export_video_csv(
 
 
 @router.get("/ranking/csv")
-async def export_ranking_csv(
+def export_ranking_csv(
     period: str = Query("30days", description="集計期間: 7days, 30days, 90days, all"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user_optional)
@@ -87,54 +101,48 @@ async def export_ranking_csv(
     else:
         start_date = None
 
-    # 統計データの集計
+    # 統計データの集計（社長別の合計・平均はDB側で計算する）
     query = db.query(VideoTigerStats)
     if start_date:
         query = query.join(Video).filter(Video.published_at >= start_date)
 
-    stats = query.all()
+    total_videos = query.with_entities(func.count(func.distinct(VideoTigerStats.video_id))).scalar()
 
-    if not stats:
+    if not total_videos:
         raise HTTPException(status_code=404, detail="統計データが見つかりません")
 
-    # 社長別に集計
-    tiger_aggregates = {}
-    for stat in stats:
-        if stat.tiger_id not in tiger_aggregates:
-            tiger_aggregates[stat.tiger_id] = {
-                "total_mentions": 0,
-                "video_count": 0,
-                "total_rate_total": 0,
-                "total_rate_entity": 0
-            }
-
-        agg = tiger_aggregates[stat.tiger_id]
-        agg["total_mentions"] += stat.n_tiger
-        agg["video_count"] += 1
-        agg["total_rate_total"] += stat.rate_total
-        agg["total_rate_entity"] += stat.rate_entity
+    # 社長マスタにある社長だけを総言及数の順に並べ、順位もDB側で付ける
+    total_mentions = func.sum(VideoTigerStats.n_tiger)
+    ranking_order = (total_mentions.desc(), VideoTigerStats.tiger_id)
+    tiger_aggregates = query.join(
+        Tiger, VideoTigerStats.tiger_id == Tiger.tiger_id
+    ).with_entities(
+        VideoTigerStats.tiger_id,
+        Tiger.display_name,
+        total_mentions.label("total_mentions"),
+        func.count().label("video_count"),
+        func.avg(VideoTigerStats.rate_total).label("avg_rate_total"),
+        func.avg(VideoTigerStats.rate_entity).label("avg_rate_entity"),
+        func.row_number().over(order_by=ranking_order).label("rank")
+    ).group_by(
+        VideoTigerStats.tiger_id, Tiger.display_name
+    ).order_by(*ranking_order).all()
 
     # ランキングデータを作成
-    tiger_rankings = []
-    for tiger_id, agg in tiger_aggregates.items():
-        tiger = db.query(Tiger).filter(Tiger.tiger_id == tiger_id).first()
-        if tiger:
-            tiger_rankings.append({
-                "tiger_id": tiger_id,
-                "display_name": tiger.display_name,
-                "total_mentions": agg["total_mentions"],
-                "video_count": agg["video_count"],
-                "avg_mentions": agg["total_mentions"] / agg["video_count"] if agg["video_count"] > 0 else 0,
-                "avg_rate_total": agg["total_rate_total"] / agg["video_count"] if agg["video_count"] > 0 else 0,
-                "avg_rate_entity": agg["total_rate_entity"] / agg["video_count"] if agg["video_count"] > 0 else 0
-            })
-
-    # 総言及数でソート
-    tiger_rankings.sort(key=lambda x: x["total_mentions"], reverse=True)
+    tiger_rankings = [{
+        "rank": agg.rank,
+        "tiger_id": agg.tiger_id,
+        "display_name": agg.display_name,
+        "total_mentions": agg.total_mentions,
+        "video_count": agg.video_count,
+        "avg_mentions": agg.total_mentions / agg.video_count,
+        "avg_rate_total": agg.avg_rate_total,
+        "avg_rate_entity": agg.avg_rate_entity
+    } for agg in tiger_aggregates]
 
     ranking_data = {
         "period": period,
-        "total_videos": len(set(s.video_id for s in stats)),
+        "total_videos": total_videos,
         "tiger_rankings": tiger_rankings
     }
 
@@ -142,46 +150,48 @@ async def export_ranking_csv(
 
 
 @router.get("/all/excel")
-async def export_all_excel(
+def export_all_excel(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user_optional)
 ):
     """
     全データをExcel形式でエクスポート
     """
+    # 各シートの行はジェネレータで渡し、Excelへ書き込みながら順に取得する
     # 社長データ
-    tigers = db.query(Tiger).all()
-    tigers_data = [{
+    tigers_data = ({
         "社長ID": t.tiger_id,
         "表示名": t.display_name,
         "本名": t.full_name,
         "説明": t.description
-    } for t in tigers]
+    } for t in db.query(
+        Tiger.tiger_id, Tiger.display_name, Tiger.full_name, Tiger.description
+    ).yield_per(EXPORT_YIELD_PER))
 
     # 動画データ
-    videos = db.query(Video).limit(100).all()  # 最新100件
-    videos_data = [{
+    videos_data = ({
         "動画ID": v.video_id,
         "タイトル": v.title,
         "公開日": v.published_at.strftime("%Y-%m-%d") if v.published_at else "",
         "再生数": v.view_count,
         "コメント数": v.comment_count
-    } for v in videos]
-
-    # 統計データ
-    stats = db.query(VideoTigerStats).limit(500).all()  # 最新500件
-    stats_data = []
-    for s in stats:
-        video = db.query(Video).filter(Video.video_id == s.video_id).first()
-        tiger = db.query(Tiger).filter(Tiger.tiger_id == s.tiger_id).first()
-        stats_data.append({
-            "動画タイトル": video.title[:50] if video else "",
-            "社長名": tiger.display_name if tiger else "",
-            "言及数": s.n_tiger,
-            "Rate_total": f"{s.rate_total * 100:.2f}%",
-            "Rate_entity": f"{s.rate_entity * 100:.2f}%",
-            "順位": s.rank
-        })
+    } for v in db.query(
+        Video.video_id, Video.title, Video.published_at, Video.view_count, Video.comment_count
+    ).limit(100).yield_per(EXPORT_YIELD_PER))  # 最新100件
+
+    # 統計データ（動画・社長は同じクエリでJOINして取得）
+    stats = db.query(VideoTigerStats).options(
+        joinedload(VideoTigerStats.video),
+        joinedload(VideoTigerStats.tiger)
+    ).limit(500).yield_per(EXPORT_YIELD_PER)  # 最新500件
+    stats_data = ({
+        "動画タイトル": s.video.title[:50] if s.video else "",
+        "社長名": s.tiger.display_name if s.tiger else "",
+        "言及数": s.n_tiger,
+        "Rate_total": f"{s.rate_total * 100:.2f}%",
+        "Rate_entity": f"{s.rate_entity * 100:.2f}%",
+        "順位": s.rank
+    } for s in stats)
 
     # Excelファイル作成
     data_dict = {
@@ -197,7 +207,7 @@ async def export_all_excel(
 
 
 @router.post("/mentions/excel")
-async def export_mentions_excel(
+def export_mentions_excel(
     request: MentionsExportRequest,
     current_user=Depends(get_current_user_optional)
 ):
@@ -33,7 +33,7 @@ class ReportRequest(BaseModel):
 
 
 @router.post("/generate")
-async def generate_report(request: ReportRequest, db: Session = Depends(get_db)):
+def generate_report(request: ReportRequest, db: Session = Depends(get_db)):
     """
     レポートを生成する
 
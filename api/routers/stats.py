@@ -6,33 +6,39 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func, extract
 from typing import List, Optional
 from datetime import datetime
-import json
 import os
 import glob
 
 from ..schemas import VideoStats, RankingStats, TigerStats
 from models import get_db, Video, Tiger, VideoTigerStats, Comment, CommentTigerRelation
+from utils.json_cache import load_json, load_json_cached
+from core.config import settings
 
 router = APIRouter()
 
+# データファイルのパス（import時に一度だけ組み立てる）
+DATA_DIR = str(settings.data_dir)
+TIGERS_FILE = os.path.join(DATA_DIR, "tigers.json")
+VIDEOS_FILE = os.path.join(DATA_DIR, "videos.json")
+
 
 @router.get("/video/{video_id}", response_model=VideoStats)
-async def get_video_stats(video_id: str, db: Session = Depends(get_db)):
+def get_video_stats(video_id: str, db: Session = Depends(get_db)):
     """動画の統計情報を取得（データベースベース、JSONフォールバック対応）"""
 
     # JSONファイルパス
-    stats_path = os.path.join(os.path.dirname(__file__), f"../../data/video_stats_{video_id}.json")
+    stats_path = os.path.join(DATA_DIR, f"video_stats_{video_id}.json")
 
     # まずDBを確認
-    video = db.query(Video).filter(Video.video_id == video_id).first()
+    video = db.query(Video.title, Video.comment_count).filter(Video.video_id == video_id).first()
 
     # DBにコメントがあるか確認
-    total_comments = db.query(Comment).filter(Comment.video_id == video_id).count()
+    total_comments = db.query(func.count(Comment.comment_id)).filter(Comment.video_id == video_id).scalar()
 
     # 社長言及コメント数を取得
-    tiger_mention_comments = db.query(Comment.comment_id).join(
+    tiger_mention_comments = db.query(func.count(func.distinct(Comment.comment_id))).join(
         CommentTigerRelation
-    ).filter(Comment.video_id == video_id).distinct().count()
+    ).filter(Comment.video_id == video_id).scalar()
 
     # 社長別統計を取得（DB）
     stats_query = db.query(
@@ -76,14 +82,11 @@ async def get_video_stats(video_id: str, db: Session = Depends(get_db)):
 
     # DBに統計がない、またはコメントがない場合はJSONフォールバック
     try:
-        with open(stats_path, 'r', encoding='utf-8') as f:
-            stats_json = json.load(f)
+        stats_json = load_json(stats_path)
 
         # JSONのdisplay_nameを最新のtigers.jsonから取得して更新
-        tigers_path = os.path.join(os.path.dirname(__file__), "../../data/tigers.json")
         try:
-            with open(tigers_path, 'r', encoding='utf-8') as f:
-                tigers_data = json.load(f)
+            tigers_data = load_json_cached(TIGERS_FILE)
             tiger_name_map = {t['tiger_id']: t['display_name'] for t in tigers_data}
             for stat in stats_json.get('tiger_stats', []):
                 if stat['tiger_id'] in tiger_name_map:
@@ -111,7 +114,7 @@ async def get_video_stats(video_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/ranking", response_model=RankingStats)
-async def get_ranking(period: str = "all", db: Session = Depends(get_db)):
+def get_ranking(period: str = "all", db: Session = Depends(get_db)):
     """
     社長別ランキングを取得（データベースベース）
 
@@ -119,7 +122,7 @@ async def get_ranking(period: str = "all", db: Session = Depends(get_db)):
         period: 集計期間 ("all", "month", "week")
     """
     # 動画数を取得
-    total_videos = db.query(Video).count()
+    total_videos = db.query(func.count(Video.video_id)).scalar()
 
     # 社長ごとの統計を集計
     results = db.query(
@@ -156,33 +159,29 @@ async def get_ranking(period: str = "all", db: Session = Depends(get_db)):
         tiger_rankings=rankings
     )
 @router.get("/overview")
-async def get_overview(db: Session = Depends(get_db)):
+def get_overview(db: Session = Depends(get_db)):
     """
     簡易な全体サマリー（レポートプレビュー等で使用）
     - total_videos: 動画数
     - total_comments: 総コメント数（DBなければJSONの合計）
     - tiger_mentions: 全動画の社長言及コメント総数（推定）
     """
-    total_videos = db.query(Video).count()
-    total_comments = db.query(Comment).count()
+    total_videos = db.query(func.count(Video.video_id)).scalar()
+    total_comments = db.query(func.count(Comment.comment_id)).scalar()
 
     if total_videos == 0 and total_comments == 0:
         # JSONフォールバック
-        import os, json
-        base = os.path.join(os.path.dirname(__file__), "../../data")
-        videos_path = os.path.join(base, "videos.json")
         try:
-            with open(videos_path, 'r', encoding='utf-8') as f:
-                vids = json.load(f)
-                total_videos = len(vids)
-                total_comments = sum(int(v.get('comment_count', 0)) for v in vids)
+            vids = load_json_cached(VIDEOS_FILE)
+            total_videos = len(vids)
+            total_comments = sum(int(v.get('comment_count', 0)) for v in vids)
         except Exception:
             pass
 
     # 言及コメント数（推定）: CommentTigerRelationのコメントID distinct
-    mention_comments = db.query(Comment.comment_id).join(
+    mention_comments = db.query(func.count(func.distinct(Comment.comment_id))).join(
         CommentTigerRelation, Comment.comment_id == CommentTigerRelation.comment_id
-    ).distinct().count()
+    ).scalar()
 
     return {
         "total_videos": total_videos,
@@ -193,7 +192,7 @@ async def get_overview(db: Session = Depends(get_db)):
 
 
 @router.get("/monthly")
-async def get_available_months(db: Session = Depends(get_db)):
+def get_available_months(db: Session = Depends(get_db)):
     """
     利用可能な月一覧を取得
     動画のpublished_atから年月を抽出して返す
@@ -227,7 +226,7 @@ async def get_available_months(db: Session = Depends(get_db)):
 
 
 @router.get("/monthly/{year}/{month}")
-async def get_monthly_stats(year: int, month: int, db: Session = Depends(get_db)):
+def get_monthly_stats(year: int, month: int, db: Session = Depends(get_db)):
     """
     特定の月の統計を取得
 
@@ -243,7 +242,9 @@ async def get_monthly_stats(year: int, month: int, db: Session = Depends(get_db)
         - videos: その月の動画一覧
     """
     # その月の動画を取得
-    videos = db.query(Video).filter(
+    videos = db.query(
+        Video.video_id, Video.title, Video.published_at, Video.thumbnail_url
+    ).filter(
         extract('year', Video.published_at) == year,
         extract('month', Video.published_at) == month
     ).order_by(Video.published_at.desc()).all()
@@ -256,17 +257,26 @@ async def get_monthly_stats(year: int, month: int, db: Session = Depends(get_db)
 
     video_ids = [v.video_id for v in videos]
 
-    # 総コメント数を取得
-    total_comments = db.query(Comment).filter(
+    # 動画ごとのコメント数・言及コメント数をGROUP BYでまとめて取得
+    comment_counts = dict(db.query(
+        Comment.video_id,
+        func.count(Comment.comment_id)
+    ).filter(
         Comment.video_id.in_(video_ids)
-    ).count()
+    ).group_by(Comment.video_id).all())
 
-    # 言及コメント数を取得
-    mention_comments = db.query(Comment.comment_id).join(
+    mention_counts = dict(db.query(
+        Comment.video_id,
+        func.count(func.distinct(Comment.comment_id))
+    ).join(
         CommentTigerRelation
     ).filter(
         Comment.video_id.in_(video_ids)
-    ).distinct().count()
+    ).group_by(Comment.video_id).all())
+
+    # コメントは1つの動画にのみ属するため、動画ごとの件数の合計が月全体の件数になる
+    total_comments = sum(comment_counts.values())
+    mention_comments = sum(mention_counts.values())
 
     # 社長別統計を集計
     rankings = db.query(
@@ -302,18 +312,12 @@ async def get_monthly_stats(year: int, month: int, db: Session = Depends(get_db)
     # 動画一覧を構築
     video_list = []
     for v in videos:
-        # 各動画のコメント数と言及コメント数を取得
-        v_total_comments = db.query(Comment).filter(Comment.video_id == v.video_id).count()
-        v_mention_comments = db.query(Comment.comment_id).join(
-            CommentTigerRelation
-        ).filter(Comment.video_id == v.video_id).distinct().count()
-
         video_list.append({
             'video_id': v.video_id,
             'title': v.title,
             'published_at': v.published_at.isoformat() if v.published_at else None,
-            'total_comments': v_total_comments,
-            'mention_comments': v_mention_comments,
+            'total_comments': comment_counts.get(v.video_id, 0),
+            'mention_comments': mention_counts.get(v.video_id, 0),
             'thumbnail_url': v.thumbnail_url
         })
 
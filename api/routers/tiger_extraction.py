@@ -23,7 +23,7 @@ class ExtractSingleRequest(BaseModel):
 
 
 @router.post("/extract/video/{video_id}")
-async def extract_tigers_from_video(
+def extract_tigers_from_video(
     video_id: str,
     db: Session = Depends(get_db)
 ):
@@ -56,7 +56,7 @@ async def extract_tigers_from_video(
 
 
 @router.post("/extract/batch")
-async def extract_tigers_batch(
+def extract_tigers_batch(
     request: ExtractRequest,
     db: Session = Depends(get_db)
 ):
@@ -82,7 +82,7 @@ async def extract_tigers_batch(
 
 
 @router.post("/extract/all")
-async def extract_tigers_from_all_videos(
+def extract_tigers_from_all_videos(
     db: Session = Depends(get_db)
 ):
     """
@@ -104,7 +104,7 @@ async def extract_tigers_from_all_videos(
 
 
 @router.get("/extract/preview/{video_id}")
-async def preview_tiger_extraction(
+def preview_tiger_extraction(
     video_id: str,
     db: Session = Depends(get_db)
 ):
@@ -3,7 +3,7 @@ Tigers (社長マスタ) API Router
 """
 from fastapi import APIRouter, HTTPException, Depends
 from typing import List
-import json
+import orjson
 import os
 import sys
 import httpx
@@ -12,55 +12,57 @@ import re
 # パスを追加してutilsをインポート可能にする
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 from utils.image_cache import download_and_cache_image, delete_cached_image
+from utils.json_cache import load_json
+from core.config import settings
 
 from ..schemas import Tiger, TigerCreate
 from ..dependencies import get_current_user_optional
 
 router = APIRouter()
 
-TIGERS_FILE = os.path.join(os.path.dirname(__file__), "../../data/tigers.json")
-ALIASES_FILE = os.path.join(os.path.dirname(__file__), "../../data/aliases.json")
+# データファイルのパス（import時に一度だけ組み立てる）
+DATA_DIR = str(settings.data_dir)
+TIGERS_FILE = os.path.join(DATA_DIR, "tigers.json")
+ALIASES_FILE = os.path.join(DATA_DIR, "aliases.json")
 
 
 def load_tigers() -> List[dict]:
     """社長マスタを読み込み"""
     try:
-        with open(TIGERS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_json(TIGERS_FILE)
     except FileNotFoundError:
         return []
 
 
 def save_tigers(tigers: List[dict]):
     """社長マスタを保存"""
-    with open(TIGERS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(tigers, f, ensure_ascii=False, indent=2)
+    with open(TIGERS_FILE, 'wb') as f:
+        f.write(orjson.dumps(tigers, option=orjson.OPT_INDENT_2))
 
 
 def load_aliases() -> dict:
     """エイリアスマスタを読み込み"""
     try:
-        with open(ALIASES_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_json(ALIASES_FILE)
     except FileNotFoundError:
         return {}
 
 
 def save_aliases(aliases: dict):
     """エイリアスマスタを保存"""
-    with open(ALIASES_FILE, 'w', encoding='utf-8') as f:
-        json.dump(aliases, f, ensure_ascii=False, indent=2)
+    with open(ALIASES_FILE, 'wb') as f:
+        f.write(orjson.dumps(aliases, option=orjson.OPT_INDENT_2))
 
 
 @router.get("", response_model=List[Tiger])
-async def get_all_tigers():
+def get_all_tigers():
     """全社長を取得"""
     tigers = load_tigers()
     return tigers
 
 
 @router.get("/{tiger_id}", response_model=Tiger)
-async def get_tiger(tiger_id: str):
+def get_tiger(tiger_id: str):
     """特定の社長を取得"""
     tigers = load_tigers()
     tiger = next((t for t in tigers if t['tiger_id'] == tiger_id), None)
@@ -228,7 +230,7 @@ async def fetch_and_cache_x_image(tiger_id: str, request: dict, current_user=Dep
 
 
 @router.get("/{tiger_id}/aliases")
-async def get_tiger_aliases(tiger_id: str):
+def get_tiger_aliases(tiger_id: str):
     """
     特定の社長のエイリアス一覧を取得
 
@@ -309,6 +311,75 @@ async def add_tiger_alias(tiger_id: str, request: dict, current_user=Depends(get
     }
 
 
+@router.post("/{tiger_id}/aliases/bulk")
+async def add_tiger_aliases_bulk(tiger_id: str, request: dict, current_user=Depends(get_current_user_optional)):
+    """
+    社長にエイリアスを一括追加（aliases.jsonの読み書きは1回のみ）
+
+    Args:
+        tiger_id: 社長ID
+        request: { "aliases": [{ "alias": "別名", "type": "タイプ", "priority": 優先度 }, ...] }
+    """
+    # 社長が存在するか確認
+    tigers = load_tigers()
+    if not any(t['tiger_id'] == tiger_id for t in tigers):
+        raise HTTPException(status_code=404, detail=f"Tiger {tiger_id} not found")
+
+    items = request.get('aliases', [])
+    if not items:
+        raise HTTPException(status_code=400, detail="aliases is required")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="aliases must be a list")
+
+    aliases = load_aliases()
+    tiger_aliases = aliases.setdefault(tiger_id, [])
+    existing = {a['alias'] for a in tiger_aliases}
+
+    added = []
+    failed = []
+    for item in items:
+        # 不正な要素は例外にせず failed に入れる（優先度のソートのため priority は整数に限る）
+        if not isinstance(item, dict):
+            failed.append({"alias": None, "reason": "each item must be an object"})
+            continue
+        alias = item.get('alias')
+        if not isinstance(alias, str) or not alias.strip():
+            failed.append({"alias": alias, "reason": "alias is required"})
+            continue
+        alias = alias.strip()
+        alias_type = item.get('type', 'other')
+        if not isinstance(alias_type, str):
+            failed.append({"alias": alias, "reason": "type must be a string"})
+            continue
+        priority = item.get('priority', 5)
+        if not isinstance(priority, int) or isinstance(priority, bool):
+            failed.append({"alias": alias, "reason": "priority must be an integer"})
+            continue
+        if alias in existing:
+            failed.append({"alias": alias, "reason": f"Alias '{alias}' already exists"})
+            continue
+
+        new_alias = {
+            "alias": alias,
+            "type": alias_type,
+            "priority": priority
+        }
+        tiger_aliases.append(new_alias)
+        existing.add(alias)
+        added.append(new_alias)
+
+    if added:
+        # 優先度順にソートしてまとめて保存
+        tiger_aliases.sort(key=lambda x: x['priority'])
+        save_aliases(aliases)
+
+    return {
+        "message": f"{len(added)} aliases added to {tiger_id}",
+        "added": added,
+        "failed": failed
+    }
+
+
 @router.post("/import/csv")
 async def import_tigers_from_csv(request: dict, current_user=Depends(get_current_user_optional)):
     """
@@ -407,7 +478,7 @@ async def import_tigers_from_csv(request: dict, current_user=Depends(get_current
 
 
 @router.get("/export/csv")
-async def export_tigers_to_csv():
+def export_tigers_to_csv():
     """
     社長マスタをCSV形式でエクスポート
     """
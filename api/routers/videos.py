@@ -4,28 +4,30 @@ Videos API Router
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
 from typing import List
-import json
 import os
 
 from ..schemas import Video, VideoWithStats
 from models import get_db, Video as VideoDB, Comment, CommentTigerRelation, VideoTigerStats, VideoTiger
+from utils.json_cache import load_json, load_json_cached, load_videos_by_id
+from core.config import settings
 
 router = APIRouter()
 
-VIDEOS_FILE = os.path.join(os.path.dirname(__file__), "../../data/videos.json")
+# データファイルのパス（import時に一度だけ組み立てる）
+DATA_DIR = str(settings.data_dir)
+VIDEOS_FILE = os.path.join(DATA_DIR, "videos.json")
 
 
 def load_videos() -> List[dict]:
-    """動画データを読み込み"""
+    """動画データを読み込み（mtimeキャッシュ経由のため返り値は変更しないこと）"""
     try:
-        with open(VIDEOS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_json_cached(VIDEOS_FILE)
     except FileNotFoundError:
         return []
 
 
 @router.get("/analyzed")
-async def get_analyzed_videos(db: Session = Depends(get_db)):
+def get_analyzed_videos(db: Session = Depends(get_db)):
     """分析済み動画を取得（VideoTigerStatsにデータがある動画）"""
     from sqlalchemy import func, distinct
 
@@ -64,7 +66,7 @@ async def get_analyzed_videos(db: Session = Depends(get_db)):
 
 
 @router.get("", response_model=List[Video])
-async def get_all_videos(db: Session = Depends(get_db)):
+def get_all_videos(db: Session = Depends(get_db)):
     """全動画を取得（DB優先、JSONフォールバック）"""
     # まずDBから取得
     db_videos = db.query(VideoDB).order_by(VideoDB.published_at.desc()).all()
@@ -90,7 +92,7 @@ async def get_all_videos(db: Session = Depends(get_db)):
 
 
 @router.get("/{video_id}", response_model=VideoWithStats)
-async def get_video(video_id: str, db: Session = Depends(get_db)):
+def get_video(video_id: str, db: Session = Depends(get_db)):
     """特定の動画を取得（統計情報付き）"""
     # まずDBから取得
     db_video = db.query(VideoDB).filter(VideoDB.video_id == video_id).first()
@@ -111,18 +113,20 @@ async def get_video(video_id: str, db: Session = Depends(get_db)):
         return video
 
     # JSONフォールバック
-    videos = load_videos()
-    video = next((v for v in videos if v['video_id'] == video_id), None)
+    try:
+        video = load_videos_by_id(VIDEOS_FILE).get(video_id)
+    except FileNotFoundError:
+        video = None
 
     if not video:
         raise HTTPException(status_code=404, detail=f"Video {video_id} not found")
+    video = dict(video)  # キャッシュを書き換えないようコピー
 
     # 統計情報を読み込み
-    stats_file = os.path.join(os.path.dirname(__file__), f"../../data/video_stats_{video_id}.json")
+    stats_file = os.path.join(DATA_DIR, f"video_stats_{video_id}.json")
     try:
-        with open(stats_file, 'r', encoding='utf-8') as f:
-            stats = json.load(f)
-            video['tiger_stats'] = stats.get('tiger_stats', [])
+        stats = load_json(stats_file)
+        video['tiger_stats'] = stats.get('tiger_stats', [])
     except FileNotFoundError:
         video['tiger_stats'] = []
 
@@ -130,7 +134,7 @@ async def get_video(video_id: str, db: Session = Depends(get_db)):
 
 
 @router.delete("/{video_id}")
-async def delete_video(video_id: str, db: Session = Depends(get_db)):
+def delete_video(video_id: str, db: Session = Depends(get_db)):
     """特定の動画とその関連データを削除"""
     try:
         # 動画が存在するか確認
@@ -173,7 +177,7 @@ async def delete_video(video_id: str, db: Session = Depends(get_db)):
 
 
 @router.delete("/reset-all/confirm")
-async def reset_all_videos(db: Session = Depends(get_db)):
+def reset_all_videos(db: Session = Depends(get_db)):
     """全動画データをリセット（DB内の動画、コメント、統計を削除）"""
     try:
         # 関連テーブルから順に削除
@@ -162,6 +162,7 @@ class CollectionProgress(BaseModel):
     total_comments: Optional[int] = None
     message: Optional[str] = None
     logs: List[LogEntry] = Field(default_factory=list)
+    log_start: int = Field(0, description="logs[0] の通し番号（古いログは上限を超えると破棄される）")
 
 
 # ========== Authentication Schemas ==========
@@ -3,6 +3,8 @@ WebSocketハンドラー
 リアルタイムダッシュボード用
 """
 from fastapi import WebSocket, WebSocketDisconnect, Depends
+from collections import Counter, OrderedDict
+from functools import lru_cache
 from typing import List, Dict, Any
 import asyncio
 import json
@@ -11,29 +13,63 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from models import get_db, Video, Comment, VideoTigerStats, Tiger
-try:
-    from analyzers.sentiment_analyzer import SentimentAnalyzer
-except Exception:
-    class _NeutralSentiment:
-        def __init__(self):
-            self.sentiment = 'neutral'
-            self.score = 0.0
-            self.positive_score = 0.0
-            self.negative_score = 0.0
-            self.neutral_score = 1.0
-
-    class SentimentAnalyzer:  # fallback stub
-        def analyze(self, _text: str):
-            return _NeutralSentiment()
 from core.cache import cache_manager
 
 
+class _NeutralSentiment:
+    __slots__ = ('sentiment', 'score', 'positive_score', 'negative_score', 'neutral_score')
+
+    def __init__(self):
+        self.sentiment = 'neutral'
+        self.score = 0.0
+        self.positive_score = 0.0
+        self.negative_score = 0.0
+        self.neutral_score = 1.0
+
+
+# 結果は常に同じなので1インスタンスを使い回す
+_NEUTRAL_RESULT = _NeutralSentiment()
+
+
+class _FallbackSentimentAnalyzer:  # fallback stub
+    def analyze(self, _text: str):
+        return _NEUTRAL_RESULT
+
+    def analyze_batch(self, texts: List[str]):
+        return [_NEUTRAL_RESULT] * len(texts)
+
+
+def _is_blank(text: str) -> bool:
+    """感情分析するまでもない空・空白だけのテキストか"""
+    return not text or text.isspace()
+
+
+@lru_cache(maxsize=1)
+def get_sentiment_analyzer():
+    """
+    感情分析器を取得
+
+    import時ではなく初回呼び出し時に生成し、以降はプロセス内で同じインスタンスを共有する。
+    analyzers.sentiment_analyzer が使えない場合は常に neutral を返すスタブを使う。
+    """
+    try:
+        from analyzers.sentiment_analyzer import SentimentAnalyzer
+    except Exception:
+        return _FallbackSentimentAnalyzer()
+    return SentimentAnalyzer()
+
+
+# 感情分析結果をテキストごとに保持する件数（LRU）
+SENTIMENT_CACHE_MAX_ENTRIES = 10000
+
+
 class ConnectionManager:
     """WebSocket接続管理クラス"""
 
     def __init__(self):
         self.active_connections: List[WebSocket] = []
-        self.sentiment_analyzer = SentimentAnalyzer()
+        # {テキスト: 感情分析結果}（同じコメントの再分析を省く）
+        self._sentiment_cache: "OrderedDict[str, Any]" = OrderedDict()
 
     async def connect(self, websocket: WebSocket):
         """新しいWebSocket接続を受け入れる"""
@@ -46,6 +82,62 @@ class ConnectionManager:
         self.active_connections.remove(websocket)
         print(f"接続切断: 現在の接続数 = {len(self.active_connections)}")
 
+    @property
+    def sentiment_analyzer(self):
+        """感情分析器（初回アクセス時に生成）"""
+        return get_sentiment_analyzer()
+
+    def _store_sentiment(self, text: str, result: Any):
+        """感情分析結果をキャッシュに登録（上限を超えたら古いものから破棄）"""
+        self._sentiment_cache[text] = result
+        if len(self._sentiment_cache) > SENTIMENT_CACHE_MAX_ENTRIES:
+            self._sentiment_cache.popitem(last=False)
+
+    def analyze_sentiment(self, text: str) -> Any:
+        """テキストの感情分析（同じテキストはキャッシュから返し、空白だけのテキストは分析せず neutral）"""
+        if _is_blank(text):
+            return _NEUTRAL_RESULT
+        result = self._sentiment_cache.get(text)
+        if result is not None:
+            self._sentiment_cache.move_to_end(text)
+            return result
+        result = self.sentiment_analyzer.analyze(text)
+        self._store_sentiment(text, result)
+        return result
+
+    def analyze_sentiments(self, texts: List[str]) -> list:
+        """
+        複数テキストの感情分析
+
+        キャッシュにないテキストだけを重複を除いて分析し、analyze_batch があれば1回の呼び出しでまとめて処理する。
+        空や空白だけのテキストは分析せず neutral とする。
+        """
+        cache = self._sentiment_cache
+        misses = [text for text in dict.fromkeys(texts) if text not in cache and not _is_blank(text)]
+        if misses:
+            analyze_batch = getattr(self.sentiment_analyzer, "analyze_batch", None)
+            if analyze_batch is not None:
+                results = analyze_batch(misses)
+            else:
+                results = [self.sentiment_analyzer.analyze(text) for text in misses]
+            analyzed = dict(zip(misses, results))
+        else:
+            analyzed = {}
+
+        sentiments = []
+        for text in texts:
+            result = analyzed.get(text)
+            if result is None:
+                if _is_blank(text):
+                    result = _NEUTRAL_RESULT
+                else:
+                    result = cache[text]
+                    cache.move_to_end(text)
+            sentiments.append(result)
+        for text, result in analyzed.items():
+            self._store_sentiment(text, result)
+        return sentiments
+
     async def send_personal_message(self, message: str, websocket: WebSocket):
         """特定の接続にメッセージを送信"""
         await websocket.send_text(message)
@@ -86,10 +178,10 @@ async def get_realtime_stats(db: Session) -> Dict[str, Any]:
     """
     try:
         # 最新の動画を取得
-        latest_videos = db.query(Video).order_by(Video.published_at.desc()).limit(5).all()
+        latest_videos = db.query(Video.video_id, Video.title, Video.comment_count).order_by(Video.published_at.desc()).limit(5).all()
 
         # 総コメント数
-        total_comments = db.query(Comment).count()
+        total_comments = db.query(func.count(Comment.comment_id)).scalar()
 
         # 社長別の言及数（上位5名）
         tiger_stats = db.query(
@@ -104,20 +196,18 @@ async def get_realtime_stats(db: Session) -> Dict[str, Any]:
             func.sum(VideoTigerStats.n_tiger).desc()
         ).limit(5).all()
 
-        # 最新コメントのサンプル取得と感情分析
-        latest_comments = db.query(Comment).order_by(
+        # 最新コメントのサンプル取得と感情分析（本文だけを取得）
+        latest_texts = [text for text, in db.query(Comment.text_original).order_by(
             Comment.published_at.desc()
-        ).limit(10).all()
+        ).limit(10).all()]
 
         sentiment_summary = {"positive": 0, "negative": 0, "neutral": 0}
-        if latest_comments:
-            for comment in latest_comments:
-                try:
-                    result = manager.sentiment_analyzer.analyze(comment.text_original)
-                    sentiment_summary[result.sentiment] += 1
-                except Exception as e:
-                    print(f"感情分析エラー: {e}")
-                    continue
+        if latest_texts:
+            try:
+                counts = Counter(result.sentiment for result in manager.analyze_sentiments(latest_texts))
+                sentiment_summary = {label: counts[label] for label in sentiment_summary}
+            except Exception as e:
+                print(f"感情分析エラー: {e}")
 
         return {
             "timestamp": datetime.now().isoformat(),
@@ -214,7 +304,7 @@ async def handle_command(websocket: WebSocket, command: Dict[str, Any], db: Sess
         text = command.get("text")
         if text:
             # 感情分析を実行
-            result = manager.sentiment_analyzer.analyze(text)
+            result = manager.analyze_sentiment(text)
             response_data = {
                 "type": "sentiment_response",
                 "sentiment": result.sentiment,
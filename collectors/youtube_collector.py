@@ -1,7 +1,7 @@
 """YouTube動画とコメントを収集するモジュール"""
-import json
 from typing import List, Dict, Optional
 from datetime import datetime
+import orjson
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
@@ -296,8 +296,8 @@ class YouTubeCollector:
             data: 保存するデータ
             filename: ファイル名
         """
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
 
 # 使用例
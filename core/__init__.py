@@ -5,6 +5,7 @@ from .config import settings
 from .security import (
     create_access_token,
     verify_password,
+    authenticate_password,
     get_password_hash,
     verify_token
 )
@@ -13,6 +14,7 @@ __all__ = [
     'settings',
     'create_access_token',
     'verify_password',
+    'authenticate_password',
     'get_password_hash',
     'verify_token'
 ]
\ No newline at end of file
@@ -1,12 +1,16 @@
 """
 Redisキャッシュ管理
 """
+import hashlib
 import json
+import logging
 import redis
 from typing import Optional, Any
 from datetime import timedelta
 from .config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class CacheManager:
     """
@@ -27,12 +31,12 @@ class CacheManager:
                     decode_responses=True
                 )
                 self.redis_client.ping()
-                print("Redisキャッシュを使用します")
+                logger.info("Redisキャッシュを使用します")
             except Exception as e:
-                print(f"Redis接続エラー: {e}")
-                print("インメモリキャッシュを使用します")
+                logger.warning(f"Redis接続エラー: {e}")
+                logger.info("インメモリキャッシュを使用します")
         else:
-            print("インメモリキャッシュを使用します")
+            logger.info("インメモリキャッシュを使用します")
 
     def get(self, key: str) -> Optional[Any]:
         """
@@ -62,7 +66,7 @@ class CacheManager:
                         return None
                 return value
         except Exception as e:
-            print(f"キャッシュ取得エラー: {e}")
+            logger.error(f"キャッシュ取得エラー: {e}")
             return None
 
     def set(
@@ -100,7 +104,7 @@ class CacheManager:
                 self.memory_cache[key] = (value, expire_ts)
                 return True
         except Exception as e:
-            print(f"キャッシュ設定エラー: {e}")
+            logger.error(f"キャッシュ設定エラー: {e}")
             return False
 
     def delete(self, key: str) -> bool:
@@ -122,7 +126,7 @@ class CacheManager:
                     return True
                 return False
         except Exception as e:
-            print(f"キャッシュ削除エラー: {e}")
+            logger.error(f"キャッシュ削除エラー: {e}")
             return False
 
     def exists(self, key: str) -> bool:
@@ -141,7 +145,7 @@ class CacheManager:
             else:
                 return key in self.memory_cache
         except Exception as e:
-            print(f"キャッシュ存在確認エラー: {e}")
+            logger.error(f"キャッシュ存在確認エラー: {e}")
             return False
 
     def clear(self, pattern: str = "*") -> bool:
@@ -174,7 +178,7 @@ class CacheManager:
                             del self.memory_cache[key]
                 return True
         except Exception as e:
-            print(f"キャッシュクリアエラー: {e}")
+            logger.error(f"キャッシュクリアエラー: {e}")
             return False
 
 
@@ -205,6 +209,27 @@ def get_analysis_cache_key(video_id: str, tiger_ids: list) -> str:
     return f"analysis:{video_id}:{tiger_ids_str}"
 
 
+def _hash_key_parts(parts: list) -> str:
+    """キーの要素をJSONにしてハッシュ化（区切り文字を含むIDでも衝突せず、長さも一定）"""
+    encoded = json.dumps(parts, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def get_video_comparison_cache_key(video_ids: list) -> str:
+    """動画比較のキャッシュキー（結果は指定順に並ぶため、IDは並べ替えない）"""
+    return f"comparison:videos:{_hash_key_parts(list(video_ids))}"
+
+
+def get_tiger_comparison_cache_key(period_days: int, tiger_ids: list) -> str:
+    """社長比較のキャッシュキー（結果は指定順に並ぶため、IDは並べ替えない）"""
+    return f"comparison:tigers:{_hash_key_parts([period_days, list(tiger_ids)])}"
+
+
 def get_ranking_cache_key(period: str) -> str:
     """ランキングのキャッシュキー"""
     return f"ranking:{period}"
+
+
+def get_collection_status_cache_key(video_id: str) -> str:
+    """コメント収集ステータスのキャッシュキー"""
+    return f"collect:{video_id}"
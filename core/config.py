@@ -4,20 +4,25 @@
 """
 from pydantic_settings import BaseSettings
 from typing import Optional
+import os
 import secrets
 from pathlib import Path
 from dotenv import load_dotenv
 
 # .envファイルを読み込み（backend/.env を優先、なければプロジェクトルート）
+# 読み込み済みの環境変数は子プロセス（ワーカー）に引き継がれるため、読み込みは最初のプロセスのみ
+_DOTENV_LOADED_FLAG = "DOTENV_LOADED"
 _base_dir = Path(__file__).resolve().parent.parent
 _env_paths = [
     _base_dir / ".env",           # backend/.env
     _base_dir.parent / ".env",    # project root/.env
 ]
-for _env_path in _env_paths:
-    if _env_path.exists():
-        load_dotenv(_env_path)
-        break
+if not os.environ.get(_DOTENV_LOADED_FLAG):
+    for _env_path in _env_paths:
+        if _env_path.exists():
+            load_dotenv(_env_path, override=False)
+            break
+    os.environ[_DOTENV_LOADED_FLAG] = "1"
 
 class Settings(BaseSettings):
     """
@@ -100,6 +105,8 @@ class Settings(BaseSettings):
     # バッチ処理設定
     batch_size: int = 100
     max_concurrent_requests: int = 5
+    collect_max_workers: int = 5  # コメント収集を同時に実行するワーカースレッド数
+    analysis_max_workers: int = 2  # コメント分析のワーカープロセス数（各プロセスがアプリを読み込むため控えめにする）
     request_delay_seconds: float = 0.5  # APIレート制限対策
 
     # ファイルパス設定（バックエンドディレクトリを基準）
@@ -2,6 +2,12 @@
 セキュリティ関連の機能
 JWT認証、パスワードハッシュ化など
 """
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional, Any
 from jose import JWTError, jwt
@@ -11,6 +17,14 @@ from .config import settings
 # パスワードのハッシュ化設定
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# ログイン時のパスワード検証結果（成功のみ）を短時間キャッシュし、連続ログインでbcryptを繰り返さない
+PASSWORD_VERIFY_CACHE_TTL = 30
+PASSWORD_VERIFY_CACHE_MAX_ENTRIES = 4096
+_verify_cache: "OrderedDict[bytes, float]" = OrderedDict()  # {キー: 期限(monotonic)}
+_verify_cache_lock = threading.Lock()
+# キャッシュキー用の鍵（プロセスごとに生成。平文パスワードはメモリに残さない）
+_verify_cache_secret = secrets.token_bytes(32)
+
 def create_access_token(
     subject: str | Any,
     expires_delta: Optional[timedelta] = None
@@ -78,6 +92,53 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     return pwd_context.verify(plain_password, hashed_password)
 
+def _verify_cache_key(username: str, plain_password: str, hashed_password: str) -> bytes:
+    """検証キャッシュのキー（ハッシュが変わればパスワード変更前の結果は使われない）"""
+    mac = hmac.new(_verify_cache_secret, digestmod=hashlib.sha256)
+    for part in (username, hashed_password, plain_password):
+        data = part.encode('utf-8')
+        mac.update(len(data).to_bytes(4, 'big'))
+        mac.update(data)
+    return mac.digest()
+
+def authenticate_password(username: str, plain_password: str, hashed_password: Optional[str]) -> bool:
+    """
+    ログイン用のパスワード検証
+
+    ユーザーが存在しない場合もダミーの検証を行い、応答時間からユーザーの有無を推測されないようにする。
+    直近に成功した同じ組み合わせはbcryptを省略する。
+
+    Args:
+        username: ユーザー名
+        plain_password: 平文パスワード
+        hashed_password: 保存されているハッシュ（ユーザーが存在しない場合はNone）
+
+    Returns:
+        パスワードが一致する場合はTrue
+    """
+    if hashed_password is None:
+        pwd_context.dummy_verify()
+        return False
+
+    key = _verify_cache_key(username, plain_password, hashed_password)
+    now = time.monotonic()
+    with _verify_cache_lock:
+        expires_at = _verify_cache.get(key)
+        if expires_at is not None:
+            if expires_at > now:
+                return True
+            del _verify_cache[key]
+
+    if not verify_password(plain_password, hashed_password):
+        return False
+
+    with _verify_cache_lock:
+        _verify_cache[key] = now + PASSWORD_VERIFY_CACHE_TTL
+        _verify_cache.move_to_end(key)
+        while len(_verify_cache) > PASSWORD_VERIFY_CACHE_MAX_ENTRIES:
+            _verify_cache.popitem(last=False)
+    return True
+
 def get_password_hash(password: str) -> str:
     """
     パスワードのハッシュ化
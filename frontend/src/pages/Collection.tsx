@@ -2,6 +2,7 @@ import { useState, useRef } from 'react'
 import { useMutation, useQueryClient } from '@tanstack/react-query'
 import { useNavigate } from 'react-router-dom'
 import { analysisApi } from '../services/api'
+import type { LogEntry } from '../types'
 import { CheckCircle, XCircle, Loader, ArrowRight, Trash2, Play, Users, AlertTriangle, Check } from 'lucide-react'
 import toast from 'react-hot-toast'
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card'
@@ -74,10 +75,17 @@ const Collection = () => {
     mutationFn: (params: { video_id: string; tiger_ids: string[] }) => analysisApi.analyze(params),
   })
 
-  const pollProgress = (videoId: string): Promise<{ status: string; collectedComments: number; message: string }> => {
+  const pollProgress = (
+    videoId: string,
+    onLogs?: (logs: LogEntry[]) => void
+  ): Promise<{ status: string; collectedComments: number; message: string }> => {
     return new Promise((resolve) => {
       let retryCount = 0
       const maxRetries = 3
+      // 受信済みのログ（logStart は logs[0] の通し番号）。2回目以降は未受信分だけを取得する
+      let logs: LogEntry[] = []
+      let logStart = 0
+      let hasLogs = false
 
       const interval = setInterval(async () => {
         if (abortRef.current) {
@@ -87,9 +95,26 @@ const Collection = () => {
         }
 
         try {
-          const status = await analysisApi.getCollectionStatus(videoId)
+          const status = await analysisApi.getCollectionStatus(
+            videoId,
+            hasLogs ? logStart + logs.length : undefined
+          )
           retryCount = 0
 
+          const newLogs = status.logs || []
+          const newStart = status.log_start ?? 0
+          if (!hasLogs || newStart < logStart || newStart > logStart + logs.length) {
+            // 初回、または受信済みのログと通し番号がつながらない場合は受信分で置き換える
+            logs = newLogs
+            logStart = newStart
+          } else {
+            logs = logs.slice(0, newStart - logStart).concat(newLogs)
+          }
+          hasLogs = true
+          if (newLogs.length > 0) {
+            onLogs?.(logs)
+          }
+
           if (status.status === 'completed') {
             clearInterval(interval)
             queryClient.invalidateQueries({ queryKey: ['videos'] })
@@ -211,7 +236,12 @@ const Collection = () => {
       const data = await collectMutation.mutateAsync({ video_url: job.url })
 
       if (data.status === 'collecting' && job.videoId) {
-        const result = await pollProgress(job.videoId)
+        const result = await pollProgress(job.videoId, (logs) => {
+          const latest = logs[logs.length - 1]
+          updateJobs(prev => prev.map((j, idx) =>
+            idx === jobIndex && j.status === 'collecting' ? { ...j, message: latest.message } : j
+          ))
+        })
 
         if (result.status === 'completed') {
           updateJobs(prev => prev.map((j, idx) =>
@@ -117,12 +117,10 @@ const Tigers = () => {
     addMutation.mutate(tigerData as Omit<Tiger, 'tiger_id'>, {
       onSuccess: async () => {
         if (aliases && aliases.length > 0 && data.tiger_id) {
-          for (const alias of aliases) {
-            try {
-              await tigersApi.addAlias(data.tiger_id, alias)
-            } catch (e) {
-              console.error('別名追加エラー:', e)
-            }
+          try {
+            await tigersApi.addAliases(data.tiger_id, aliases)
+          } catch (e) {
+            console.error('別名追加エラー:', e)
           }
           queryClient.invalidateQueries({ queryKey: ['aliases', data.tiger_id] })
         }
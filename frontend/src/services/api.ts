@@ -89,6 +89,11 @@ export const tigersApi = {
     return data;
   },
 
+  addAliases: async (tigerId: string, aliases: Array<{ alias: string; type: string; priority: number }>): Promise<any> => {
+    const { data } = await api.post(`/api/v1/tigers/${tigerId}/aliases/bulk`, { aliases });
+    return data;
+  },
+
   deleteAlias: async (tigerId: string, alias: string): Promise<any> => {
     const { data } = await api.delete(`/api/v1/tigers/${tigerId}/aliases/${encodeURIComponent(alias)}`);
     return data;
@@ -143,8 +148,10 @@ export const analysisApi = {
     return data;
   },
 
-  getCollectionStatus: async (videoId: string): Promise<CollectionProgress> => {
-    const { data } = await api.get(`/api/v1/analysis/collect/${videoId}`);
+  // since を指定すると、通し番号 since 以降のログだけを返す
+  getCollectionStatus: async (videoId: string, since?: number): Promise<CollectionProgress> => {
+    const params = since !== undefined ? { since } : {};
+    const { data } = await api.get(`/api/v1/analysis/collect/${videoId}`, { params });
     return data;
   },
 
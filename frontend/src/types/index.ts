@@ -106,6 +106,7 @@ export interface CollectionProgress {
   total_comments?: number;
   message?: string;
   logs: LogEntry[];
+  log_start?: number; // logs[0] の通し番号（古いログは上限を超えると破棄される）
 }
 
 // 月別統計の型定義
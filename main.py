@@ -6,7 +6,7 @@ from pathlib import Path
 from fastapi import FastAPI, Depends, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
 from sqlalchemy.exc import SQLAlchemyError
@@ -48,11 +48,15 @@ async def lifespan(app: FastAPI):
     # シャットダウン時の処理
     print("👋 アプリケーションを終了します...")
 
+    # コメント収集・分析のワーカーを停止
+    analysis.shutdown_executors()
+
 app = FastAPI(
     title=settings.app_name,
     description="YouTube動画のコメントを分析し、社長別の言及を集計するAPI",
     version=settings.app_version,
     redirect_slashes=False,  # 末尾スラッシュの自動リダイレクトを無効化
+    default_response_class=ORJSONResponse,  # レスポンスのJSONエンコードはorjsonで行う
     lifespan=lifespan
 )
 
@@ -1,8 +1,9 @@
 """社長マスタ管理モジュール"""
-import json
 import os
 from typing import Dict, List, Optional
 
+import orjson
+
 
 class TigerManager:
     """社長マスタとエイリアスを管理"""
@@ -22,13 +23,48 @@ class TigerManager:
         self.tigers_file = tigers_file
         self.aliases_file = aliases_file
 
+        # 参照専用キャッシュ {ファイルパス: (mtime, データ)}
+        # 保存時に破棄し、外部からの更新はmtimeの変化で検知する
+        self._read_cache: Dict[str, tuple] = {}
+
+    def _load_cached(self, path: str, loader):
+        """
+        参照専用のデータをキャッシュ経由で取得
+
+        Args:
+            path: JSONファイルのパス
+            loader: キャッシュが無効な場合に呼ぶ読み込み関数
+
+        Returns:
+            読み込んだデータ（呼び出し側で変更しないこと）
+        """
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = None
+
+        cached = self._read_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        data = loader()
+        self._read_cache[path] = (mtime, data)
+        return data
+
+    def _get_tiger_index(self) -> Dict[str, Dict]:
+        """tiger_id → 社長情報 の辞書をキャッシュ経由で取得"""
+        return self._load_cached(
+            self.tigers_file,
+            lambda: {t['tiger_id']: t for t in self.load_tigers()}
+        )
+
     def load_tigers(self) -> List[Dict]:
         """社長マスタを読み込み"""
         if not os.path.exists(self.tigers_file):
             return []
 
-        with open(self.tigers_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(self.tigers_file, 'rb') as f:
+            return orjson.loads(f.read())
 
     def save_tigers(self, tigers: List[Dict]) -> bool:
         """
@@ -44,8 +80,9 @@ class TigerManager:
             # ディレクトリが存在しない場合は作成
             os.makedirs(os.path.dirname(self.tigers_file), exist_ok=True)
 
-            with open(self.tigers_file, 'w', encoding='utf-8') as f:
-                json.dump(tigers, f, ensure_ascii=False, indent=2)
+            with open(self.tigers_file, 'wb') as f:
+                f.write(orjson.dumps(tigers, option=orjson.OPT_INDENT_2))
+            self._read_cache.pop(self.tigers_file, None)
             return True
         except Exception as e:
             print(f"Error saving tigers: {e}")
@@ -56,8 +93,8 @@ class TigerManager:
         if not os.path.exists(self.aliases_file):
             return {}
 
-        with open(self.aliases_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(self.aliases_file, 'rb') as f:
+            return orjson.loads(f.read())
 
     def save_aliases(self, aliases: Dict) -> bool:
         """
@@ -72,8 +109,9 @@ class TigerManager:
         try:
             os.makedirs(os.path.dirname(self.aliases_file), exist_ok=True)
 
-            with open(self.aliases_file, 'w', encoding='utf-8') as f:
-                json.dump(aliases, f, ensure_ascii=False, indent=2)
+            with open(self.aliases_file, 'wb') as f:
+                f.write(orjson.dumps(aliases, option=orjson.OPT_INDENT_2))
+            self._read_cache.pop(self.aliases_file, None)
             return True
         except Exception as e:
             print(f"Error saving aliases: {e}")
@@ -89,11 +127,7 @@ class TigerManager:
         Returns:
             社長情報、存在しない場合はNone
         """
-        tigers = self.load_tigers()
-        for tiger in tigers:
-            if tiger['tiger_id'] == tiger_id:
-                return tiger
-        return None
+        return self._get_tiger_index().get(tiger_id)
 
     def add_tiger(
         self,
@@ -218,7 +252,7 @@ class TigerManager:
         Returns:
             エイリアスのリスト
         """
-        aliases = self.load_aliases()
+        aliases = self._load_cached(self.aliases_file, self.load_aliases)
         return aliases.get(tiger_id, [])
 
     def add_alias(
@@ -76,4 +76,9 @@ def init_db():
     """
     from . import models  # モデルをインポート
     Base.metadata.create_all(bind=engine)
+
+    # create_all は既存テーブルに後から追加したインデックスを作らないため個別に作成する
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
     print("データベースを初期化しました。")
\ No newline at end of file
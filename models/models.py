@@ -33,7 +33,7 @@ class Comment(Base):
     __tablename__ = "comments"
 
     comment_id = Column(String, primary_key=True)
-    video_id = Column(String, ForeignKey("videos.video_id"), nullable=False)
+    video_id = Column(String, ForeignKey("videos.video_id"), nullable=False, index=True)
     text_original = Column(Text, nullable=False)
     normalized_text = Column(Text)
     author_name = Column(String)
@@ -87,7 +87,7 @@ class VideoTiger(Base):
     __tablename__ = "video_tigers"
 
     video_id = Column(String, ForeignKey("videos.video_id"), primary_key=True)
-    tiger_id = Column(String, ForeignKey("tigers.tiger_id"), primary_key=True)
+    tiger_id = Column(String, ForeignKey("tigers.tiger_id"), primary_key=True, index=True)  # video_id は主キーの先頭列で引ける
     appearance_order = Column(Integer)  # 出演順序
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -100,8 +100,8 @@ class CommentTigerRelation(Base):
     __tablename__ = "comment_tiger_relations"
 
     relation_id = Column(Integer, primary_key=True, autoincrement=True)
-    comment_id = Column(String, ForeignKey("comments.comment_id"), nullable=False)
-    tiger_id = Column(String, ForeignKey("tigers.tiger_id"), nullable=False)
+    comment_id = Column(String, ForeignKey("comments.comment_id"), nullable=False, index=True)
+    tiger_id = Column(String, ForeignKey("tigers.tiger_id"), nullable=False, index=True)
     matched_alias = Column(String)  # マッチした呼称
     match_method = Column(String)  # rule_based, llm_assisted
     confidence_score = Column(Float, default=1.0)
@@ -116,7 +116,7 @@ class VideoTigerStats(Base):
     __tablename__ = "video_tiger_stats"
 
     video_id = Column(String, ForeignKey("videos.video_id"), primary_key=True)
-    tiger_id = Column(String, ForeignKey("tigers.tiger_id"), primary_key=True)
+    tiger_id = Column(String, ForeignKey("tigers.tiger_id"), primary_key=True, index=True)  # video_id は主キーの先頭列で引ける
     n_total = Column(Integer, default=0)  # 動画の総コメント数
     n_entity = Column(Integer, default=0)  # 社長に言及したコメント数（全体）
     n_tiger = Column(Integer, default=0)  # この社長に言及したコメント数
@@ -1,5 +1,6 @@
 """統計集計モジュール"""
 import json
+from collections import Counter
 from typing import List, Dict
 
 
@@ -34,11 +35,14 @@ class StatsAggregator:
         # N_total: 総コメント数
         N_total = len(analyzed_comments)
 
-        # 社長に言及しているコメントのセット
+        # 1パスで社長言及コメントと社長別の言及コメント数を数える
         entity_comment_ids = set()
+        tiger_counts = Counter()
         for comment in analyzed_comments:
-            if comment['tiger_mentions']:
+            mentions = comment['tiger_mentions']
+            if mentions:
                 entity_comment_ids.add(comment['comment_id'])
+                tiger_counts.update({m['tiger_id'] for m in mentions})
 
         # N_entity: 誰かしらの社長に言及しているコメント数
         N_entity = len(entity_comment_ids)
@@ -48,10 +52,7 @@ class StatsAggregator:
 
         for tiger_id in appearing_tigers:
             # N_tiger: この社長に言及しているコメント数
-            N_tiger = sum(
-                1 for comment in analyzed_comments
-                if any(m['tiger_id'] == tiger_id for m in comment['tiger_mentions'])
-            )
+            N_tiger = tiger_counts[tiger_id]
 
             # Rate_total: 総コメント数に対する割合（絶対的存在感）
             Rate_total = (N_tiger / N_total * 100) if N_total > 0 else 0
@@ -2,6 +2,7 @@
 import json
 import re
 import unicodedata
+from collections import Counter
 from typing import List, Dict, Set
 
 
@@ -161,12 +162,15 @@ class CommentAnalyzer:
         """
         stats = {}
 
-        # 各社長の言及数をカウント
+        # 各社長の言及コメント数を1パスでカウント
+        mention_counts = Counter()
+        for comment in analyzed_comments:
+            mentions = comment['tiger_mentions']
+            if mentions:
+                mention_counts.update({m['tiger_id'] for m in mentions})
+
         for tiger_id in self.tigers.keys():
-            mention_count = sum(
-                1 for comment in analyzed_comments
-                if any(m['tiger_id'] == tiger_id for m in comment['tiger_mentions'])
-            )
+            mention_count = mention_counts[tiger_id]
             stats[tiger_id] = {
                 'tiger_id': tiger_id,
                 'display_name': self.tigers[tiger_id]['display_name'],
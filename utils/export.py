@@ -2,12 +2,34 @@
 データエクスポート機能
 CSV、Excel形式でのエクスポートをサポート
 """
+import codecs
 import csv
 import io
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterable, Iterator, List
 from datetime import datetime
-import pandas as pd
 from fastapi.responses import StreamingResponse
+from openpyxl import Workbook
+
+# CSVをストリーミングする際に1チャンクへまとめる行数
+CSV_STREAM_ROWS = 1000
+
+
+def _iter_csv_chunks(data: List[Dict[str, Any]]) -> Iterator[bytes]:
+    """CSVをBOM付きUTF-8で CSV_STREAM_ROWS 行ずつエンコードして返す"""
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=data[0].keys())
+    writer.writeheader()
+    yield codecs.BOM_UTF8
+
+    for i, row in enumerate(data, 1):
+        writer.writerow(row)
+        if i % CSV_STREAM_ROWS == 0:
+            yield output.getvalue().encode('utf-8')
+            output.seek(0)
+            output.truncate()
+
+    if output.tell():
+        yield output.getvalue().encode('utf-8')
 
 
 def export_to_csv(
@@ -22,7 +44,7 @@ def export_to_csv(
         filename: ファイル名（省略時は自動生成）
 
     Returns:
-        CSV形式のストリーミングレスポンス
+        CSV形式のストリーミングレスポンス（全体を文字列に組み立てず行単位で送出）
     """
     if not data:
         return StreamingResponse(
@@ -35,16 +57,9 @@ def export_to_csv(
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"export_{timestamp}.csv"
 
-    # CSV生成
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=data[0].keys())
-    writer.writeheader()
-    writer.writerows(data)
-
     # ストリーミングレスポンスの作成
-    output.seek(0)
     return StreamingResponse(
-        io.BytesIO(output.getvalue().encode('utf-8-sig')),  # BOM付きUTF-8
+        _iter_csv_chunks(data),  # BOM付きUTF-8
         media_type="text/csv",
         headers={
             "Content-Disposition": f"attachment; filename={filename}",
@@ -114,7 +129,7 @@ def export_ranking_to_csv(
 
     for rank, tiger in enumerate(ranking_data.get("tiger_rankings", []), 1):
         data.append({
-            "順位": rank,
+            "順位": tiger.get("rank", rank),
             "社長ID": tiger.get("tiger_id"),
             "社長名": tiger.get("display_name"),
             "総言及数": tiger.get("total_mentions"),
@@ -171,15 +186,42 @@ def export_comments_to_csv(
     return export_to_csv(data, filename)
 
 
+def _write_sheet(workbook: Workbook, sheet_name: str, data: Iterable[Dict[str, Any]]) -> bool:
+    """
+    辞書の並びを1シートとして書き込み（行は1件ずつ追記し、表全体を組み立てない）
+
+    リストの場合は全行のキーを列に含める。ジェネレータなどの場合は先頭行のキーを列とする。
+
+    Returns:
+        シートを作成した場合はTrue（データが空なら作成しない）
+    """
+    rows = iter(data)
+    first = next(rows, None)
+    if first is None:
+        return False
+
+    if isinstance(data, list):
+        columns = list(dict.fromkeys(key for row in data for key in row))
+    else:
+        columns = list(first)
+
+    worksheet = workbook.create_sheet(title=sheet_name[:31])
+    worksheet.append(columns)
+    worksheet.append([first.get(column) for column in columns])
+    for row in rows:
+        worksheet.append([row.get(column) for column in columns])
+    return True
+
+
 def export_to_excel(
-    data_dict: Dict[str, List[Dict[str, Any]]],
+    data_dict: Dict[str, Iterable[Dict[str, Any]]],
     filename: str = None
 ) -> StreamingResponse:
     """
     複数のデータセットをExcel形式でエクスポート
 
     Args:
-        data_dict: シート名をキー、データをバリューとする辞書
+        data_dict: シート名をキー、データ（辞書のリストまたはジェネレータ）をバリューとする辞書
         filename: ファイル名（省略時は自動生成）
 
     Returns:
@@ -190,13 +232,16 @@ def export_to_excel(
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"export_{timestamp}.xlsx"
 
-    # Excel生成
+    # Excel生成（書き込み専用モードで行ごとに出力）
+    workbook = Workbook(write_only=True)
+    written = False
+    for sheet_name, data in data_dict.items():
+        written = _write_sheet(workbook, sheet_name, data) or written
+    if not written:
+        workbook.create_sheet()
+
     output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        for sheet_name, data in data_dict.items():
-            if data:
-                df = pd.DataFrame(data)
-                df.to_excel(writer, sheet_name=sheet_name[:31], index=False)
+    workbook.save(output)
 
     # ストリーミングレスポンスの作成
     output.seek(0)
@@ -207,4 +252,4 @@ def export_to_excel(
             "Content-Disposition": f"attachment; filename={filename}",
             "Content-Type": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         }
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,100 @@
+"""
+JSONファイル読み込みユーティリティ
+tigers.json / aliases.json / videos.json のような更新頻度の低いファイルを
+mtimeで無効化しながらプロセス内にキャッシュする
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Tuple
+
+import orjson
+
+# {パス: (mtime_ns, データ)}（読み取り専用で使うこと）
+_json_cache: Dict[str, Tuple[int, Any]] = {}
+# {(パス, 名前): (mtime_ns, 組み立てた値)}
+_derived_cache: Dict[Tuple[str, str], Tuple[int, Any]] = {}
+
+
+def load_json(path: str) -> Any:
+    """JSONファイルを読み込み（orjson）"""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+
+def load_json_cached(path: str) -> Any:
+    """
+    JSONファイルをmtimeで無効化されるキャッシュ経由で読み込み
+
+    返り値はリクエスト間で共有されるため変更しないこと（必要ならコピーする）。
+    """
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = _json_cache.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    data = load_json(path)
+    _json_cache[path] = (mtime_ns, data)
+    return data
+
+
+@contextmanager
+def atomic_write(path) -> Iterator[BinaryIO]:
+    """
+    一時ファイル経由でファイルを書き込み（バイナリ）
+
+    path と同じディレクトリに書き込みごとに一意な一時ファイルを作り、正常に抜けたら os.replace で置き換える
+    （同じファイルへ同時に書き込んでも一時ファイルを取り合わない）。例外で抜けた場合は一時ファイルを削除し、
+    元のファイルは変更しない。mkstemp は 0600 で作成するため、通常のデータファイルと同じ 0644 に揃える。
+    """
+    path = os.fspath(path)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            os.chmod(tmp_path, 0o644)
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def store_json_cache(path: str, data: Any):
+    """書き込んだ直後の内容をキャッシュに登録し、次回の再パースを省く"""
+    _json_cache[path] = (os.stat(path).st_mtime_ns, data)
+
+
+def index_videos_by_id(videos: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """videos.json の内容から video_id → 動画情報 の辞書を作成（IDが重複する場合は先頭を優先）"""
+    index: Dict[str, Dict[str, Any]] = {}
+    for video in videos:
+        index.setdefault(video['video_id'], video)
+    return index
+
+
+def load_videos_by_id(path: str) -> Dict[str, Dict[str, Any]]:
+    """videos.json を video_id で引ける辞書として取得（mtimeで無効化、変更しないこと）"""
+    return load_derived_cached(path, 'videos_by_id', index_videos_by_id)
+
+
+def load_derived_cached(path: str, name: str, build: Callable[[Any], Any]) -> Any:
+    """
+    JSONファイルから組み立てた索引などを、元ファイルのmtimeで無効化されるキャッシュ経由で取得
+
+    Args:
+        path: 元のJSONファイルのパス
+        name: 組み立て方ごとの識別名
+        build: 読み込んだJSONから値を組み立てる関数
+
+    Returns:
+        組み立てた値（リクエスト間で共有されるため変更しないこと）
+    """
+    mtime_ns = os.stat(path).st_mtime_ns
+    key = (path, name)
+    cached = _derived_cache.get(key)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    value = build(load_json_cached(path))
+    _derived_cache[key] = (mtime_ns, value)
+    return value
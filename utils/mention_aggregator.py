@@ -4,12 +4,16 @@
 """
 from __future__ import annotations
 
-import json
+from collections import Counter
 from pathlib import Path
 from typing import Dict, List, Any, Tuple
 from datetime import datetime, timezone
 
-from analyzers.comment_analyzer import CommentAnalyzer
+import orjson
+
+from analyzers.comment_analyzer import build_alias_text_index, get_comment_analyzer
+from utils.json_cache import atomic_write, load_derived_cached, load_json, load_json_cached
+from utils.timestamps import parse_iso_datetime
 from typing import Optional
 import re
 
@@ -23,7 +27,7 @@ except Exception:
 def _parse_dt(dt_str: str) -> datetime:
     """ISO8601文字列をdatetime(UTCに正規化)へ"""
     try:
-        dt = datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
+        dt = parse_iso_datetime(dt_str)
     except Exception:
         dt = datetime.min.replace(tzinfo=timezone.utc)
     if dt.tzinfo is None:
@@ -34,36 +38,52 @@ def _parse_dt(dt_str: str) -> datetime:
 def _load_json(path: Path) -> Any:
     if not path.exists():
         return None
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    return load_json(str(path))
+
+
+def _load_json_cached(path: Path) -> Any:
+    """更新頻度の低いマスタ類（mtimeで無効化されるキャッシュ経由、変更しないこと）"""
+    if not path.exists():
+        return None
+    return load_json_cached(str(path))
 
 
-def _ensure_analyzed(data_dir: Path, video_id: str, tiger_ids: List[str]) -> List[Dict[str, Any]]:
-    """解析済みコメントファイルがなければ作成して返す"""
+def _ensure_analyzed(
+    data_dir: Path,
+    video_id: str,
+    tiger_ids: List[str],
+    comments: Optional[List[Dict[str, Any]]] = None
+) -> List[Dict[str, Any]]:
+    """解析済みコメントファイルがなければ作成して返す（commentsは読み込み済みなら渡す）"""
     analyzed_path = data_dir / f"analyzed_comments_{video_id}.json"
     if analyzed_path.exists():
         return _load_json(analyzed_path) or []
 
-    comments_path = data_dir / f"comments_{video_id}.json"
-    comments = _load_json(comments_path) or []
+    if comments is None:
+        comments = _load_json(data_dir / f"comments_{video_id}.json") or []
     # コメント未取得なら空
     if not comments:
         return []
 
     tigers_file = data_dir / "tigers.json"
     aliases_file = data_dir / "aliases.json"
-    analyzer = CommentAnalyzer(str(tigers_file), str(aliases_file))
+    analyzer = get_comment_analyzer(str(tigers_file), str(aliases_file))
     analyzed: List[Dict[str, Any]] = []
-    for c in comments:
-        r = analyzer.find_tiger_mentions(c.get("text", ""), target_tigers=tiger_ids)
-        analyzed.append({
-            **c,
-            "normalized_text": r.get("normalized_text"),
-            "tiger_mentions": r.get("mentions", []),
-        })
-
-    with analyzed_path.open("w", encoding="utf-8") as f:
-        json.dump(analyzed, f, ensure_ascii=False, indent=2)
+    # 解析しながら1件ずつ書き出し、最後に置き換える（巨大な一括シリアライズを避ける）
+    with atomic_write(analyzed_path) as f:
+        f.write(b"[")
+        for c in comments:
+            r = analyzer.find_tiger_mentions(c.get("text", ""), target_tigers=tiger_ids)
+            record = {
+                **c,
+                "normalized_text": r.get("normalized_text"),
+                "tiger_mentions": r.get("mentions", []),
+            }
+            if analyzed:
+                f.write(b",")
+            f.write(orjson.dumps(record))
+            analyzed.append(record)
+        f.write(b"]")
 
     return analyzed
 
@@ -85,10 +105,18 @@ def _build_alias_patterns(aliases_map: Dict[str, List[Dict[str, Any]]]) -> Dict[
     return patterns
 
 
-def _resolve_target_ids(requested_ids: List[str], aliases_data: Dict[str, List[Dict[str, Any]]], tigers_data: List[Dict[str, Any]]):
+def _resolve_target_ids(
+    requested_ids: List[str],
+    aliases_data: Dict[str, List[Dict[str, Any]]],
+    tigers_data: List[Dict[str, Any]],
+    alias_text_index: Optional[Dict[str, str]] = None
+):
     """tigers.jsonのID配列を、aliases.jsonのキーへ解決。
+    alias_text_index: エイリアス文字列→キーの逆引き（省略時はaliases_dataから作成）
     Returns: (alias_ids(list), alias_to_requested(dict), requested_to_alias(dict))
     """
+    if alias_text_index is None:
+        alias_text_index = build_alias_text_index(aliases_data)
     alias_ids: List[str] = []
     alias_to_requested: Dict[str, str] = {}
     requested_to_alias: Dict[str, str] = {}
@@ -102,15 +130,9 @@ def _resolve_target_ids(requested_ids: List[str], aliases_data: Dict[str, List[D
         dname, fname = disp_map.get(req, ('',''))
         matched = None
         if dname:
-            for k, alias_list in aliases_data.items():
-                if any(a.get('alias') == dname for a in alias_list):
-                    matched = k
-                    break
+            matched = alias_text_index.get(dname)
         if not matched and fname:
-            for k, alias_list in aliases_data.items():
-                if any(a.get('alias') == fname for a in alias_list):
-                    matched = k
-                    break
+            matched = alias_text_index.get(fname)
         alias_key = matched or req
         alias_ids.append(alias_key)
         alias_to_requested[alias_key] = req
@@ -143,9 +165,9 @@ def aggregate_mentions(
         start_date = start_date.replace(tzinfo=timezone.utc)
     if end_date.tzinfo is None:
         end_date = end_date.replace(tzinfo=timezone.utc)
-    videos_data = _load_json(data_dir / "videos.json") or []
-    tigers_data = _load_json(data_dir / "tigers.json") or []
-    aliases_data = _load_json(data_dir / "aliases.json") or {}
+    videos_data = _load_json_cached(data_dir / "videos.json") or []
+    tigers_data = _load_json_cached(data_dir / "tigers.json") or []
+    aliases_data = _load_json_cached(data_dir / "aliases.json") or {}
     tiger_map = {t["tiger_id"]: t for t in tigers_data}
 
     # 期間内の動画を抽出
@@ -155,15 +177,27 @@ def aggregate_mentions(
         if start_date <= dt <= end_date:
             videos.append(v)
 
+    # 期間内の総コメント数（動画ループで数え、年間サマリーで使う）
+    period_total_comments = 0
+
     # 動画単位の集計
     videos_sheet: List[Dict[str, Any]] = []
 
-    # 人別集計: 出演動画本数 / コメント出現数
+    # 人別集計: 出演動画本数 / コメント出現数 / 言及回数
     person_video_count = {tid: 0 for tid in tiger_ids}
     person_comment_mentions = {tid: 0 for tid in tiger_ids}
+    person_occurrences = {tid: 0 for tid in tiger_ids}
+    # 言及IDの判定用（リストの線形探索を避ける）
+    tiger_id_set = set(tiger_ids)
 
     # 入力IDをaliases側IDに解決
-    alias_ids, alias_to_req, req_to_alias = _resolve_target_ids(tiger_ids, aliases_data, tigers_data)
+    aliases_path = data_dir / "aliases.json"
+    alias_text_index = (
+        load_derived_cached(str(aliases_path), "alias_text_index", build_alias_text_index)
+        if aliases_path.exists() else {}
+    )
+    alias_ids, alias_to_req, req_to_alias = _resolve_target_ids(tiger_ids, aliases_data, tigers_data, alias_text_index)
+    alias_id_set = set(alias_ids)
     # エイリアスパターン（occurrence用）: alias_idベース
     alias_patterns = _build_alias_patterns({aid: aliases_data.get(aid, []) for aid in alias_ids})
 
@@ -176,15 +210,17 @@ def aggregate_mentions(
         # コメント総数
         comments = _load_json(data_dir / f"comments_{vid}.json") or []
         total_comments = len(comments)
+        period_total_comments += total_comments
 
         # 解析済みコメント（なければ作成）
         # 解析（不足時）: analyzerにはaliases側IDを渡す
-        analyzed = _ensure_analyzed(data_dir, vid, alias_ids)
+        analyzed = _ensure_analyzed(data_dir, vid, alias_ids, comments)
+        del comments
 
         # 動画内で言及があった対象社長（コメント上の言及）
         mentioned_tigers_in_video = set()
-        # 各対象社長のこの動画でのコメント出現数
-        per_video_comment_mentions = {tid: 0 for tid in tiger_ids}
+        # 各対象社長のこの動画でのコメント出現数（1コメント内の重複は1回）
+        per_video_comment_mentions: Counter = Counter()
         # 各対象社長のこの動画での文字列登場回数
         per_video_occurrence_mentions = {tid: 0 for tid in tiger_ids}
 
@@ -193,22 +229,21 @@ def aggregate_mentions(
             text = ac.get("normalized_text") or ac.get("text", "")
 
             # comment_analyzer形式(エイリアスID) or UI整形(リクエストID)の両対応
-            m_ids: List[str] = []
+            m_ids = set()
             for m in mentions:
                 mid = m.get("tiger_id") or m.get("tigerId")
                 if not mid:
                     continue
-                if mid in tiger_ids:
-                    m_ids.append(mid)
-                elif mid in alias_ids:
+                if mid in tiger_id_set:
+                    m_ids.add(mid)
+                elif mid in alias_id_set:
                     # エイリアスID→リクエストIDへ
                     rid = alias_to_req.get(mid)
-                    if rid and rid in tiger_ids:
-                        m_ids.append(rid)
+                    if rid and rid in tiger_id_set:
+                        m_ids.add(rid)
             if m_ids:
-                for tid in set(m_ids):
-                    per_video_comment_mentions[tid] += 1
-                    mentioned_tigers_in_video.add(tid)
+                per_video_comment_mentions.update(m_ids)
+                mentioned_tigers_in_video.update(m_ids)
 
             # 文字列登場回数
             if text:
@@ -226,6 +261,7 @@ def aggregate_mentions(
             if per_video_comment_mentions[tid] > 0:
                 person_video_count[tid] += 1
                 person_comment_mentions[tid] += per_video_comment_mentions[tid]
+            person_occurrences[tid] += per_video_occurrence_mentions[tid]
 
         # 動画一覧レコード
         # 出演者算定（DB優先オプション）
@@ -262,17 +298,8 @@ def aggregate_mentions(
             },
         })
 
-    # 人別集計シート
+    # 人別集計シート（言及回数は動画ループ内で集計済み）
     people_sheet: List[Dict[str, Any]] = []
-    # 人別集計シート：言及回数（occurrence）も算出
-    # videos_sheetから集計（対象期間内のみ）
-    # per_video_occurrence_mentions の総和
-    person_occurrences = {tid: 0 for tid in tiger_ids}
-    for row in videos_sheet:
-        for tid in tiger_ids:
-            key = f"{tiger_map.get(tid, {}).get('display_name', tid)}_言及回数"
-            person_occurrences[tid] += int(row.get(key, 0) or 0)
-
     for tid in tiger_ids:
         people_sheet.append({
             "社長ID": tid,
@@ -284,10 +311,6 @@ def aggregate_mentions(
 
     # 年間サマリー（期間全体のまとめ）
     total_videos = len(videos)
-    total_comments = 0
-    for v in videos:
-        comments = _load_json(data_dir / f"comments_{v['video_id']}.json") or []
-        total_comments += len(comments)
 
     # 人別ランキング（count_modeに応じて基準変更）
     ranking_key = "言及回数" if count_mode == "occurrence" else "コメント出現数"
@@ -311,7 +334,7 @@ def aggregate_mentions(
         "対象期間開始": start_date.strftime("%Y-%m-%d"),
         "対象期間終了": end_date.strftime("%Y-%m-%d"),
         "動画本数": total_videos,
-        "総コメント数": total_comments,
+        "総コメント数": period_total_comments,
     })
     # ランキングは別行で
     summary_sheet.extend(ranking)
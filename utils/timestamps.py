@@ -0,0 +1,39 @@
+"""
+ISO 8601 タイムスタンプのパースユーティリティ
+YouTube APIの published_at（末尾Z）を文字列置換なしでdatetimeへ変換する
+"""
+import sys
+from datetime import datetime
+from typing import Optional
+
+try:
+    import ciso8601
+except ImportError:  # 未インストール時は標準ライブラリで代替
+    ciso8601 = None
+
+# Python 3.11以降の fromisoformat は末尾Zをそのまま解釈できる
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+
+
+def parse_iso_datetime(value: str) -> datetime:
+    """
+    ISO 8601文字列をdatetimeへ変換
+
+    Raises:
+        ValueError: 形式が不正な場合
+    """
+    if ciso8601 is not None:
+        return ciso8601.parse_datetime(value)
+    if not _FROMISOFORMAT_ACCEPTS_Z and value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
+
+
+def parse_iso_datetime_or_none(value: Optional[str]) -> Optional[datetime]:
+    """ISO 8601文字列をdatetimeへ変換（空・不正な値はNone）"""
+    if not value:
+        return None
+    try:
+        return parse_iso_datetime(value)
+    except (ValueError, TypeError):
+        return None
@@ -1,4 +1,6 @@
 """UI/UXコンポーネントユーティリティ - Professional Design System"""
+from functools import lru_cache
+
 import streamlit as st
 
 
@@ -241,6 +243,7 @@ def apply_custom_css():
     """, unsafe_allow_html=True)
 
 
+@lru_cache(maxsize=256)
 def icon(name, size="md", color=None, style="fas"):
     """Font Awesomeアイコンを表示
 
@@ -249,6 +252,8 @@ def icon(name, size="md", color=None, style="fas"):
         size: サイズ ("sm", "md", "lg", "xl")
         color: 色 (CSSカラー)
         style: スタイル ("fas"=solid, "far"=regular, "fab"=brands)
+
+    同じ引数のHTML文字列はキャッシュして再利用する
     """
     color_style = f"color: {color};" if color else ""
     return f'<i class="{style} fa-{name} icon icon-{size}" style="{color_style}"></i>'
@@ -406,25 +411,41 @@ def create_info_card(title, content, icon_name="info-circle", color="#3B82F6"):
     st.markdown(html, unsafe_allow_html=True)
 
 
-def create_status_badge(status, text=None):
-    """ステータスバッジを作成"""
-    status_config = {
-        'success': {'class': 'badge-success', 'icon': 'check-circle', 'text': '成功'},
-        'warning': {'class': 'badge-warning', 'icon': 'exclamation-triangle', 'text': '警告'},
-        'error': {'class': 'badge-danger', 'icon': 'times-circle', 'text': 'エラー'},
-        'info': {'class': 'badge-primary', 'icon': 'info-circle', 'text': '情報'},
-        'pending': {'class': 'badge-gray', 'icon': 'clock', 'text': '保留中'},
-    }
-
-    config = status_config.get(status, status_config['info'])
-    display_text = text or config['text']
+_STATUS_BADGE_CONFIG = {
+    'success': {'class': 'badge-success', 'icon': 'check-circle', 'text': '成功'},
+    'warning': {'class': 'badge-warning', 'icon': 'exclamation-triangle', 'text': '警告'},
+    'error': {'class': 'badge-danger', 'icon': 'times-circle', 'text': 'エラー'},
+    'info': {'class': 'badge-primary', 'icon': 'info-circle', 'text': '情報'},
+    'pending': {'class': 'badge-gray', 'icon': 'clock', 'text': '保留中'},
+}
 
-    return f'''
+# バッジHTMLのテンプレート（{text} のみ呼び出し時に差し込む）
+_STATUS_BADGE_TEMPLATES = {
+    status: f'''
     <span class="badge {config['class']}">
         <i class="fas fa-{config['icon']}"></i>
-        {display_text}
+        {{text}}
     </span>
     '''
+    for status, config in _STATUS_BADGE_CONFIG.items()
+}
+
+# デフォルト文言のバッジはモジュール読み込み時に生成しておく
+STATUS_BADGES = {
+    status: template.format(text=_STATUS_BADGE_CONFIG[status]['text'])
+    for status, template in _STATUS_BADGE_TEMPLATES.items()
+}
+
+
+def create_status_badge(status, text=None):
+    """ステータスバッジを作成"""
+    if status not in _STATUS_BADGE_CONFIG:
+        status = 'info'
+
+    if not text:
+        return STATUS_BADGES[status]
+
+    return _STATUS_BADGE_TEMPLATES[status].format(text=text)
 
 
 def create_empty_state(icon_name, title, description, action_text=None):